@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
 from typing import Dict, Optional, Literal
-from ..utils.logger import log_system_event, log_error
+from ..utils.logger import log_system_event, log_error, set_verbose_errors
 
 BackendOption = Literal["auto", "tensorrt", "directml", "openvino", "cpu"]
 
@@ -34,10 +34,25 @@ class DetectionConfig:
     count_line_width_percent: float = 1.0
     preferred_backend: BackendOption = "auto"
     model_path_tensorrt: str = "modelos/best.engine"
+    trt_half: bool = True  # Engine TensorRT em FP16
+    trt_int8: bool = False  # Engine TensorRT em INT8 (requer calibration_yaml)
+    calibration_yaml: str = "calib/calib.yaml"  # Dataset de calibração INT8 (model_optimizer --int8)
+    engine_max_det: int = 100  # Máximo de caixas devolvidas pelo NMS embutido no engine TensorRT
     model_path_openvino: str = "modelos/best_openvino_model"
+    model_path_openvino_int8: str = "modelos/best_int8_openvino_model"  # Gerado por model_optimizer --int8
+    openvino_cache_dir: str = "modelos/openvino_cache"  # Vazio desativa o cache de compilação
+    openvino_enabled: bool = True  # Exporta o modelo OpenVINO (pulado se o TensorRT já atende)
     auto_optimize: bool = True
     prefer_gpu: bool = True
     max_detection_failures: int = 150
+    detection_stride: int = 2  # Roda o detector a cada N frames (1 = todos)
+    gpu_crossing: bool = True  # TensorRT: calcula o cruzamento na GPU (só os IDs contados vêm para a CPU)
+    cuda_pinned_upload: bool = False  # TensorRT: envia frames via buffer pinned fixo (sem sobrepor a inferência)
+    imgsz: int = 640  # Tamanho de entrada do modelo (upload CUDA e forward traçado)
+    traced_predictor: bool = False  # Modelos .pt: forward traçado (torch.jit) + ByteTrack direto
+    detection_threads_per_cam: int = 0  # Threads internas do OpenCV por câmera (0 = automático)
+    pin_detection_threads: bool = False  # Fixa cada thread de detecção num núcleo (Linux, só backends GPU)
+    use_gstreamer: bool = True  # RTSP via GStreamer (NVDEC quando TensorRT); senão FFMPEG
 
 
 @dataclass
@@ -55,6 +70,7 @@ class AppConfig:
     cameras: Dict[int, CameraConfig] = field(default_factory=dict)
     detection: DetectionConfig = field(default_factory=DetectionConfig) # Usa defaults do dataclass
     ui: UIConfig = field(default_factory=UIConfig)
+    verbose_errors: bool = True  # Traceback completo nos logs de erro (False = só a mensagem)
 
 
 class ConfigManager:
@@ -83,7 +99,9 @@ class ConfigManager:
             detection = DetectionConfig(**filtered_det)
             ui_data = data.get('ui', {}); valid_ui_keys = UIConfig.__annotations__.keys(); filtered_ui = {k: v for k, v in ui_data.items() if k in valid_ui_keys}
             ui = UIConfig(**filtered_ui)
-            self.config = AppConfig(cameras=cameras, detection=detection, ui=ui)
+            self.config = AppConfig(cameras=cameras, detection=detection, ui=ui,
+                                    verbose_errors=bool(data.get('verbose_errors', True)))
+            set_verbose_errors(self.config.verbose_errors)
             log_system_event("CONFIG_LOADED_SUCCESSFULLY")
         except Exception as e:
             log_error("ConfigManager", e, "Erro ao carregar config, criando padrão")
@@ -130,7 +148,8 @@ class ConfigManager:
             config_dict = {
                 'cameras': {str(k): asdict(v) for k, v in self.config.cameras.items()},
                 'detection': asdict(self.config.detection),
-                'ui': asdict(self.config.ui)
+                'ui': asdict(self.config.ui),
+                'verbose_errors': self.config.verbose_errors
             }
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config_dict, f, indent=4, ensure_ascii=False)
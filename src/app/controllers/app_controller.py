@@ -3,6 +3,7 @@ Controlador principal da aplicação
 """
 from typing import Optional, Callable, Any
 from datetime import datetime
+from enum import IntEnum
 
 from ..models.entities import User, DetectionSession, CameraStatus, CargoType, DailyReport
 from ..services.auth_service import AuthService
@@ -12,6 +13,34 @@ from ..config.settings import config_manager, CameraConfig, AppConfig # Importa
 from ..utils.logger import log_user_action, log_system_event, log_error
 
 
+class UIEvent(IntEnum):
+    """Eventos tratados pela UI; o valor indexa a tabela de callbacks do controller"""
+    LOGIN_SUCCESS = 0
+    LOGIN_FAILED = 1
+    REGISTER_SUCCESS = 2
+    SELF_REGISTER_SUCCESS = 3
+    REGISTER_FAILED = 4
+    LOGOUT_SUCCESS = 5
+    DETECTION_STARTING = 6
+    DETECTION_STARTED = 7
+    DETECTION_STOPPED = 8
+    DETECTION_FAILED = 9
+    DETECTION_UPDATE = 10
+    FRAME_WANTED = 11
+    COUNT_RESET = 12
+    REPORT_GENERATED = 13
+    REPORT_FAILED = 14
+    CONFIG_UPDATED = 15
+    CAMERA_ADDED = 16
+    CAMERA_REMOVED = 17
+    ERROR = 18
+
+    @property
+    def key(self) -> str:
+        """Nome do evento em trigger_ui_event (ex.: "detection_update")"""
+        return self.name.lower()
+
+
 class AppController:
     """Controlador principal da aplicação"""
 
@@ -22,13 +51,22 @@ class AppController:
         self.config = config_manager
         self.current_user: Optional[User] = None
         self.ui_callbacks: dict[str, Callable] = {}
+        self._cb_table: list[Optional[Callable]] = [None] * len(UIEvent)  # Mesmos callbacks, por UIEvent
         log_system_event("APP_CONTROLLER_INITIALIZED")
 
     def set_ui_callback(self, event: str, callback: Callable) -> None:
         """Define callback para eventos da UI"""
         self.ui_callbacks[event] = callback
+        ui_event = UIEvent.__members__.get(event.upper())
+        if ui_event is not None: self._cb_table[ui_event] = callback
         log_system_event(f"UI_CALLBACK_SET: {event}")
 
+    def set_ui_callbacks(self, callbacks: dict[UIEvent, Callable]) -> None:
+        """Define vários callbacks da UI de uma vez: na tabela por UIEvent e no registro por nome"""
+        for ui_event, callback in callbacks.items(): self._cb_table[ui_event] = callback
+        self.ui_callbacks.update({ui_event.key: callback for ui_event, callback in callbacks.items()})
+        log_system_event(f"UI_CALLBACKS_SET: {', '.join(ui_event.key for ui_event in callbacks)}")
+
     def trigger_ui_event(self, event: str, *args, **kwargs) -> None:
         """Dispara evento para a UI"""
         callback = self.ui_callbacks.get(event)
@@ -81,10 +119,24 @@ class AppController:
         return cameras_data
     # --- FIM CORREÇÃO ---
 
+    def get_dashboard_cameras(self) -> tuple[list[int], list[str], list[bool]]:
+        """Câmeras habilitadas para o dashboard, em listas paralelas: (ids, nomes, detecção ativa)."""
+        ids: list[int] = []; names: list[str] = []; is_active: list[bool] = []
+        try:
+            for camera_id, camera_config in dict(self.config.config.cameras).items():
+                if not camera_config.enabled: continue
+                ids.append(camera_id); names.append(camera_config.name)
+                is_active.append(self.detection_service.is_detection_active(camera_id))
+        except Exception as e:
+            log_error("AppController", e, "Erro ao obter lista de câmeras")
+            self.trigger_ui_event("error", "Erro ao carregar câmeras.")
+            return [], [], []
+        return ids, names, is_active
+
     def start_camera_detection(self, camera_id: int, cargo_type: CargoType) -> bool:
         if not self.current_user: self.trigger_ui_event("error", "Usuário não autenticado"); return False
         log_user_action(self.current_user.username, f"START_DETECTION_REQUESTED: Cam={camera_id}, Type={cargo_type.value}")
-        success = self.detection_service.start_detection(camera_id=camera_id, username=self.current_user.username, cargo_type=cargo_type, callback=self._on_detection_update)
+        success = self.detection_service.start_detection(camera_id=camera_id, username=self.current_user.username, cargo_type=cargo_type, callback=self._on_detection_update, frame_wanted=self._frame_wanted)
         if not success: log_error("AppController", None, f"Falha ao solicitar início da detecção para Cam={camera_id}")
         return success
 
@@ -99,7 +151,7 @@ class AppController:
                 log_system_event(f"GENERATING_DAILY_REPORT: Cam={camera_id}", camera_id)
                 try:
                     cam_config = self.config.get_camera(camera_id); cam_name = cam_config.name if cam_config else f"Câmera {camera_id}"
-                    report_data = DailyReport(camera_name=cam_name, tipo=session.cargo_type, total=session.detection_count, horaInicio=session.start_time, horaTermino=session.end_time)
+                    report_data = DailyReport(camera_name=cam_name, tipo=session.cargo_type, total=session.detection_count, horaInicio=session.start_time, horaTermino=session.end_time, crossing_times=list(session.crossing_times))
                     filepath = self.report_service.generate_daily_report(report_data)
                     if filepath: log_system_event(f"REPORT_GENERATED: {filepath}", camera_id); self.trigger_ui_event("report_generated", camera_id, filepath)
                     else: log_error("AppController", None, f"ReportService falhou ao gerar PDF para Cam={camera_id}"); self.trigger_ui_event("report_failed", camera_id, "Falha ao gerar PDF do relatório (ver logs)")
@@ -107,13 +159,30 @@ class AppController:
             else: log_system_event(f"SKIPPING_REPORT_NO_COUNT: Cam={camera_id}", camera_id); self.trigger_ui_event("detection_stopped_no_report", camera_id)
         return stopped
 
+    def stop_all_detections(self, camera_ids: list[int]) -> None:
+        """Para várias câmeras: sinaliza todas antes de aguardar (as esperas se sobrepõem) e finaliza cada sessão"""
+        log_system_event(f"STOP_DETECTIONS_REQUESTED: Cams={camera_ids}"); self.detection_service.signal_stop(camera_ids)
+        for camera_id in camera_ids: self.stop_camera_detection(camera_id)
+
     def get_detection_count(self, camera_id: int) -> int: return self.detection_service.get_detection_count(camera_id)
     def reset_detection_count(self, camera_id: int) -> bool:
         log_system_event(f"RESET_COUNT_REQUESTED: Cam={camera_id}", camera_id); success = self.detection_service.reset_count(camera_id)
         if success: log_system_event(f"COUNT_RESET_CONFIRMED_BY_SERVICE: Cam={camera_id}", camera_id)
         else: log_error("AppController", None, f"Falha ao solicitar reset da contagem para Cam={camera_id}"); self.trigger_ui_event("error", f"Não foi possível resetar a contagem da Câmera {camera_id}.")
         return success
-    def _on_detection_update(self, camera_id: int, count: int, frame: Optional[Any]) -> None: self.trigger_ui_event("detection_update", camera_id, count, frame)
+    def _on_detection_update(self, camera_id: int, count: int, frame: Optional[Any]) -> None:
+        """Chamado a cada frame (thread de detecção): callback por índice na tabela, sem busca por nome"""
+        callback = self._cb_table[UIEvent.DETECTION_UPDATE]
+        if callback is None: return
+        try: callback(camera_id, count, frame)
+        except Exception as e: log_error("AppController", e, "Erro fatal no callback da UI 'detection_update'")
+
+    def _frame_wanted(self, camera_id: int) -> bool:
+        """Consulta a UI (thread de detecção) se um novo frame será exibido; sem UI registrada, sempre True"""
+        callback = self._cb_table[UIEvent.FRAME_WANTED]
+        if callback is None: return True
+        try: return bool(callback(camera_id))
+        except Exception as e: log_error("AppController", e, "Erro no callback da UI 'frame_wanted'"); return True
 
     # --- Métodos de Relatório ---
     def generate_simple_report(self, camera_id: int) -> Optional[str]:
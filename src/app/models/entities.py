@@ -42,6 +42,11 @@ class User:
     last_login: Optional[datetime] = None
     is_active: bool = True  # CAMPO ADICIONADO
 
+    def __post_init__(self):
+        # Garante o invariante: role é sempre UserRole (aceita o valor em texto, ex.: "admin")
+        if not isinstance(self.role, UserRole):
+            self.role = UserRole(self.role)
+
     def to_dict(self) -> dict:
         """Converte para dicionário"""
         return {
@@ -87,8 +92,7 @@ class DetectionSession:
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
     detection_count: int = 0
-
-    # Adicionar outros campos se necessário (ex: lista de eventos)
+    crossing_times: List[float] = field(default_factory=list)  # Instante (epoch) de cada contagem
 
     def end_session(self):
         self.end_time = datetime.now()
@@ -141,6 +145,7 @@ class DailyReport:
     total: int
     horaInicio: datetime
     horaTermino: datetime
+    crossing_times: List[float] = field(default_factory=list)  # Instante (epoch) de cada contagem
     data: datetime.date = field(init=False)  # Data extraída do início
     totalHoras: float = field(init=False)  # Calculado
 
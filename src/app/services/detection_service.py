@@ -2,10 +2,16 @@
 Serviço de detecção com seleção inteligente de backend (TensorRT/DirectML/OpenVINO/CPU)
 e lógica de contagem aprimorada.
 """
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
 import threading
 import time
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Tuple
 import cv2
 import torch
 import numpy as np
@@ -14,12 +20,264 @@ from ultralytics import YOLO
 from ..models.entities import DetectionSession, CameraStatus, CargoType
 from ..config.settings import config_manager, BackendOption, CameraConfig
 from ..utils.logger import log_system_event, log_error, log_user_action
+from ..utils.crossing import CrossingState, compute_line_metrics
+from ..utils.gpu_upload import CudaFrameUploader
+from ..utils.paths import get_user_data_path
+from ..utils.model_optimizer import get_tensorrt_engine_path
 
 # --- Constantes ---
 CROSSING_THRESHOLD = 0.60  # Limiar de 70% para contagem
+BACKEND_CACHE_FILE = "backend.json"
 DEFAULT_RTSP_TIMEOUT = 10 # Segundos de timeout para conexão RTSP (ajuste conforme necessário)
+GST_DECODER_NVIDIA = "nvv4l2decoder ! nvvidconv ! video/x-raw,format=BGRx"  # NVDEC
+GST_DECODER_CPU = "avdec_h264"
+BOX_COLOR = (255, 128, 0)  # BGR
 # --- Fim Constantes ---
 
+
+@lru_cache(maxsize=None)
+def _gstreamer_available() -> bool:
+    """Verifica se o OpenCV foi compilado com suporte a GStreamer"""
+    for line in cv2.getBuildInformation().splitlines():
+        if "GStreamer" in line:
+            return "YES" in line
+    return False
+
+
+def _open_stream(source: str, use_nvdec: bool, use_gstreamer: bool) -> cv2.VideoCapture:
+    """
+    Abre um stream de rede com decodificação por hardware e buffer mínimo.
+
+    Com GStreamer, usa NVDEC (GPU NVIDIA) ou avdec_h264 (CPU) e um appsink que
+    mantém só o último frame. Sem GStreamer (ou se o pipeline falhar), cai para
+    FFMPEG com buffer interno reduzido a 1 frame.
+    """
+    if use_gstreamer and source.startswith("rtsp://") and _gstreamer_available():
+        decoder = GST_DECODER_NVIDIA if use_nvdec else GST_DECODER_CPU
+        pipeline = (f"rtspsrc location={source} latency=0 ! rtph264depay ! h264parse ! {decoder} ! "
+                    "videoconvert ! video/x-raw,format=BGR ! appsink drop=1 max-buffers=1 sync=false")
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            log_system_event(f"SOURCE_GSTREAMER_{'NVDEC' if use_nvdec else 'CPU'}")
+            return cap
+        cap.release()
+        log_error("DetectionService", None, f"Pipeline GStreamer falhou para '{source}'. Usando FFMPEG.")
+    cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def _enable_openvino_cache(cache_dir: str) -> bool:
+    """
+    Faz o Core do OpenVINO usado pelo Ultralytics gravar/ler o modelo compilado
+    em `cache_dir`, evitando recompilar a cada início.
+
+    O Ultralytics não expõe a configuração do compile_model, então o método é
+    envolvido para acrescentar CACHE_DIR quando ele não foi informado.
+    """
+    try:
+        import openvino as ov
+    except ImportError:
+        return False
+    if getattr(ov.Core.compile_model, "_las_cache_dir", None) == cache_dir:
+        return True
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    original = getattr(ov.Core.compile_model, "__wrapped__", ov.Core.compile_model)
+
+    @wraps(original)
+    def compile_model(self, *args, **kwargs):
+        if len(args) < 3:  # config não passado por posição
+            config = dict(kwargs.get("config") or {})
+            config.setdefault("CACHE_DIR", cache_dir)
+            kwargs["config"] = config
+        return original(self, *args, **kwargs)
+
+    compile_model._las_cache_dir = cache_dir
+    ov.Core.compile_model = compile_model
+    return True
+
+
+def _line_geometry(shape: Tuple[int, int], linha_y_pos: float, line_width_percent: float) -> Tuple[int, int, int]:
+    """Calcula (y da linha, x inicial, x final) em pixels para a resolução do frame"""
+    frame_height, frame_width = shape
+    line_pixel_width = frame_width * line_width_percent
+    x_start = int((frame_width - line_pixel_width) / 2)
+    return int(frame_height * linha_y_pos), x_start, int(x_start + line_pixel_width)
+
+
+def _draw_boxes(frame: np.ndarray, xyxy: np.ndarray, ids: np.ndarray, confs: np.ndarray) -> None:
+    """Desenha caixas, IDs e confiança direto sobre o frame (sem cópias)"""
+    for (x1, y1, x2, y2), obj_id, conf in zip(xyxy.tolist(), ids.tolist(), confs.tolist()):
+        cv2.rectangle(frame, (x1, y1), (x2, y2), BOX_COLOR, 1)
+        cv2.putText(frame, f"id{obj_id} {conf:.2f}", (x1, max(y1 - 4, 10)), cv2.FONT_HERSHEY_SIMPLEX, 0.4,
+                    BOX_COLOR, 1, cv2.LINE_AA)
+
+
+def _configure_cv_threads(threads_per_cam: int, expected_cameras: int) -> int:
+    """
+    Limita o pool de threads interno do OpenCV para que N câmeras em paralelo
+    não disputem mais núcleos do que existem (reserva um núcleo para UI/logs).
+    """
+    if threads_per_cam <= 0:
+        threads_per_cam = max(1, (os.cpu_count() or 1) // max(1, expected_cameras) - 1)
+    cv2.setNumThreads(threads_per_cam)
+    return threads_per_cam
+
+
+_GPU_BACKENDS = frozenset({"TensorRT", "DirectML"})  # Inferência fora da CPU
+
+
+def _pin_current_thread(camera_id: int) -> Optional[int]:
+    """
+    Fixa a thread atual num núcleo dedicado à câmera, deixando o núcleo 0 para a UI.
+    Só tem efeito onde os.sched_setaffinity existe (Linux).
+    """
+    cpu_count = os.cpu_count() or 1
+    if not hasattr(os, "sched_setaffinity") or cpu_count < 2:
+        return None
+    core_id = 1 + camera_id % (cpu_count - 1)
+    try:
+        os.sched_setaffinity(0, {core_id})  # 0 = thread chamadora
+    except OSError:
+        return None
+    return core_id
+
+
+class _SharedDisplay:
+    """
+    Janela OpenCV única (depuração) com todas as câmeras lado a lado.
+
+    As threads de detecção só publicam o último frame; uma única thread faz o
+    imshow/waitKey, evitando um loop de eventos e um blit por câmera.
+    """
+    WINDOW_NAME = "LAS Cams - Depuração"
+    REFRESH_INTERVAL = 0.03  # Segundos entre atualizações da janela
+
+    def __init__(self, on_quit: Callable[[], None]):
+        self._on_quit = on_quit
+        self._lock = threading.Lock()
+        self._frames: Dict[int, np.ndarray] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, camera_id: int, frame: np.ndarray) -> None:
+        """Publica o frame mais recente da câmera (inicia a thread de exibição se preciso)"""
+        with self._lock:
+            self._frames[camera_id] = frame
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="Detection-Display")
+                self._thread.start()
+
+    def remove(self, camera_id: int) -> None:
+        """Retira a câmera da janela (a janela fecha quando não restar nenhuma)"""
+        with self._lock:
+            self._frames.pop(camera_id, None)
+
+    def _compose(self, frames: list) -> np.ndarray:
+        """Redimensiona para a mesma altura e junta os frames horizontalmente"""
+        height = min(frame.shape[0] for frame in frames)
+        resized = [frame if frame.shape[0] == height else
+                   cv2.resize(frame, (int(frame.shape[1] * height / frame.shape[0]), height))
+                   for frame in frames]
+        return resized[0] if len(resized) == 1 else np.hstack(resized)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._frames:
+                        self._thread = None
+                        break
+                    frames = [self._frames[cam_id] for cam_id in sorted(self._frames)]
+                cv2.imshow(self.WINDOW_NAME, self._compose(frames))
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    self._on_quit()
+                time.sleep(self.REFRESH_INTERVAL)
+        except Exception as e:
+            log_error("Detection-Display", e, "Erro na janela de depuração")
+            with self._lock:
+                self._thread = None
+        finally:
+            try:
+                cv2.destroyWindow(self.WINDOW_NAME); cv2.waitKey(10)
+            except Exception:
+                pass
+
+
+class _CaptureThread(threading.Thread):
+    """
+    Lê frames da fonte continuamente e guarda apenas o mais recente.
+
+    Desacopla a leitura (I/O bloqueante) da inferência: se a inferência for
+    mais lenta que a câmera, os frames antigos são descartados. Depois de
+    iniciada, a thread é dona da captura: ela mesma chama cap.release() ao sair,
+    nunca com um read() em andamento (liberar durante a leitura derruba FFMPEG/GStreamer).
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, max_failures: int, name: str):
+        super().__init__(daemon=True, name=name)
+        self._cap = cap
+        self._max_failures = max_failures
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.latest: Optional[np.ndarray] = None
+        self.frame_ready = threading.Event()
+
+    def run(self) -> None:
+        falhas_consecutivas = 0
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self._cap.read()
+                if not ret or frame is None:
+                    falhas_consecutivas += 1
+                    if falhas_consecutivas > self._max_failures: break
+                    self._stop_event.wait(0.1)
+                    continue
+                falhas_consecutivas = 0
+                with self._lock:
+                    self.latest = frame
+                    self.frame_ready.set()
+        except Exception as e:
+            log_error(self.name, e, "Erro na leitura de frames")
+        finally:
+            try:
+                if self._cap.isOpened(): self._cap.release(); log_system_event(f"SOURCE_RELEASED: {self.name}")
+            except Exception as cap_e:
+                log_error(self.name, cap_e, "Erro ao liberar captura de vídeo")
+            self.frame_ready.set()  # Acorda o consumidor para perceber o fim
+
+    def take(self) -> Optional[np.ndarray]:
+        """Retira o frame mais recente (None se não houver frame novo)"""
+        with self._lock:
+            frame = self.latest
+            self.latest = None
+            self.frame_ready.clear()
+        return frame
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """
+        Sinaliza a parada e aguarda a leitura em andamento terminar. Retorna False
+        se a thread ainda está presa num read(): ela libera a captura quando sair.
+        """
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        return not self.is_alive()
+
+
+def _optional_backend_versions() -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Versão instalada de cada backend opcional (None se ausente), lida dos metadados, sem importar"""
+    versions = []
+    for module, dist in (("torch_directml", "torch-directml"), ("openvino", "openvino")):
+        version = None
+        if importlib.util.find_spec(module) is not None:
+            try:
+                version = importlib.metadata.version(dist)
+            except importlib.metadata.PackageNotFoundError:
+                version = "?"  # Instalado sem metadados (ex.: cópia local)
+        versions.append((module, version))
+    return tuple(versions)
+
+
 class DetectionService:
     """
     Gerencia as threads de detecção para múltiplas câmeras, selecionando
@@ -42,13 +300,27 @@ class DetectionService:
         self.selected_model_path: str = ""
         self.selected_device_args: dict = {}
         self.backend_name: str = "N/A"
+        # Janela de depuração compartilhada ('q' para todas as câmeras)
+        self._display = _SharedDisplay(
+            on_quit=lambda: [event.set() for event in list(self._stop_events.values())])
 
         self._initialize_backend()
+        cfg = self.config.config.detection
+        enabled_cameras = sum(1 for cam in self.config.config.cameras.values() if cam.enabled)
+        cv_threads = _configure_cv_threads(cfg.detection_threads_per_cam, enabled_cameras)
+        log_system_event(f"OPENCV_THREADS_PER_CAMERA_{cv_threads}")
 
     def _initialize_backend(self):
         """Determina e configura o backend de detecção."""
         try:
-            self._get_best_backend()
+            cache_key = self._backend_cache_key()
+            if not self._load_backend_cache(cache_key):
+                self._get_best_backend()
+                self._save_backend_cache(cache_key)
+            if self.backend_name == "OpenVINO":
+                cache_dir = self.config.config.detection.openvino_cache_dir
+                if cache_dir and _enable_openvino_cache(cache_dir):
+                    print(f"   💾 Cache de compilação OpenVINO: {cache_dir}")
             if self.backend_name != "N/A":
                 log_system_event(f"DETECTION_SERVICE_INITIALIZED_BACKEND_{self.backend_name.upper()}")
             else:
@@ -59,6 +331,53 @@ class DetectionService:
             self.backend_name = "N/A" # Garante estado inválido
             self.trigger_ui_event("error", f"Falha crítica ao inicializar backend de IA: {e}")
 
+    def _backend_cache_key(self) -> str:
+        """
+        Chave da detecção de backend: muda se torch/CUDA, os backends opcionais
+        instalados, a preferência ou os arquivos de modelo mudarem (sem importar
+        torch_directml/openvino nem iniciar CUDA).
+        """
+        cfg = self.config.config.detection
+        model_paths = (cfg.model_path, get_tensorrt_engine_path(cfg), cfg.model_path_openvino,
+                       getattr(cfg, 'model_path_openvino_int8', ""))
+        mtimes = tuple(Path(p).stat().st_mtime if p and Path(p).exists() else None for p in model_paths)
+        raw = (torch.__version__, torch.version.cuda, os.environ.get("CUDA_VISIBLE_DEVICES"),
+               _optional_backend_versions(), cfg.preferred_backend, model_paths, mtimes)
+        return hashlib.sha1(str(raw).encode("utf-8")).hexdigest()
+
+    def _load_backend_cache(self, cache_key: str) -> bool:
+        """Reaproveita o backend detectado numa execução anterior, se a chave bater."""
+        cache_file = get_user_data_path(BACKEND_CACHE_FILE)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get('key') != cache_key or not Path(cached.get('model_path', "")).exists():
+            return False
+        if cached.get('backend') == "TensorRT" and not torch.cuda.is_available():
+            return False  # GPU removida/driver indisponível desde a última detecção
+        self.backend_name = cached['backend']
+        self.selected_model_path = cached['model_path']
+        self.selected_device_args = cached.get('device_args', {})
+        print(f"⚙️  Backend em cache: {self.backend_name} ({self.selected_model_path})")
+        return True
+
+    def _save_backend_cache(self, cache_key: str) -> None:
+        """Grava o backend escolhido de forma atômica (arquivo temporário + replace)."""
+        if self.backend_name == "N/A":
+            return
+        cache_file = get_user_data_path(BACKEND_CACHE_FILE)
+        data = {'key': cache_key, 'backend': self.backend_name,
+                'model_path': self.selected_model_path, 'device_args': self.selected_device_args}
+        try:
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            log_error("DetectionService", e, "Falha ao gravar cache de backend")
+
     def _get_best_backend(self) -> None:
         """Seleciona o backend (automático ou preferencial) e configura paths/args."""
         cfg = self.config.config.detection
@@ -81,7 +400,7 @@ class DetectionService:
         if preference != "auto":
             print(f"   Tentando backend preferido: {preference.upper()}")
             if preference == "tensorrt" and torch.cuda.is_available():
-                if try_set_backend("TensorRT", cfg.model_path_tensorrt, {'device': 0}):
+                if try_set_backend("TensorRT", get_tensorrt_engine_path(cfg), {'device': 0}):
                     preferred_backend_set = True
                     print(f"   👍 Preferência atendida: {self.backend_name} (NVIDIA GPU)")
                     try: print(f"      GPU: {torch.cuda.get_device_name(0)}")
@@ -98,7 +417,7 @@ class DetectionService:
                             except: pass
                 except (ImportError, AttributeError): pass # Ignora se torch_directml não estiver instalado
             elif preference == "openvino":
-                if try_set_backend("OpenVINO", cfg.model_path_openvino, {}):
+                if try_set_backend("OpenVINO", self._openvino_model_path(cfg), {}):
                     preferred_backend_set = True
                     print(f"   👍 Preferência atendida: {self.backend_name} (Intel CPU/iGPU)")
             elif preference == "cpu":
@@ -112,7 +431,7 @@ class DetectionService:
         # 2. Detecção Automática (Fallback)
         print("   🤖 Iniciando detecção automática de backend...")
         # TensorRT
-        if torch.cuda.is_available() and try_set_backend("TensorRT", cfg.model_path_tensorrt, {'device': 0}):
+        if torch.cuda.is_available() and try_set_backend("TensorRT", get_tensorrt_engine_path(cfg), {'device': 0}):
             print(f"   🥇 Detectado: {self.backend_name} (NVIDIA GPU)")
             try: print(f"      GPU: {torch.cuda.get_device_name(0)}")
             except: pass
@@ -127,7 +446,7 @@ class DetectionService:
                 return
         except (ImportError, AttributeError): pass
         # OpenVINO
-        if try_set_backend("OpenVINO", cfg.model_path_openvino, {}):
+        if try_set_backend("OpenVINO", self._openvino_model_path(cfg), {}):
             print(f"   🥉 Detectado: {self.backend_name} (Intel CPU/iGPU)")
             return
         # CPU (Fallback final)
@@ -141,14 +460,45 @@ class DetectionService:
         print(f"   ❌ Nenhum backend de detecção pôde ser configurado!")
 
 
+    def _build_traced_tracker(self, model: YOLO, cfg, thread_name: str):
+        """Traça o modelo .pt para o backend atual; retorna None se não for possível."""
+        try:
+            from ..utils.traced_tracker import TracedTracker
+            if self.backend_name == "DirectML":
+                import torch_directml
+                device = torch_directml.device()
+            else:
+                device = torch.device(self.selected_device_args.get('device', 'cpu'))
+            traced = TracedTracker(model.model, device, cfg.imgsz, cfg.confidence_threshold)
+            print(f"   ⚡ [{thread_name}] Forward traçado ({cfg.imgsz}px) + ByteTrack")
+            return traced
+        except Exception as e:
+            log_error(thread_name, e, "Falha ao traçar o modelo. Usando model.track().")
+            return None
+
+    @staticmethod
+    def _openvino_model_path(cfg) -> str:
+        """Prefere o IR quantizado INT8, se existir; senão usa o FP32/FP16."""
+        int8_path = getattr(cfg, 'model_path_openvino_int8', "")
+        if int8_path and Path(int8_path).exists():
+            print(f"   ⚡ OpenVINO INT8 disponível: {int8_path}")
+            return int8_path
+        return cfg.model_path_openvino
+
     def start_detection(
             self,
             camera_id: int,
             username: str,
             cargo_type: CargoType,
-            callback: Optional[Callable[[int, int, np.ndarray], None]] = None
+            callback: Optional[Callable[[int, int, np.ndarray], None]] = None,
+            frame_wanted: Optional[Callable[[int], bool]] = None
     ) -> bool:
-        """Inicia a thread de detecção para uma câmera."""
+        """
+        Inicia a thread de detecção para uma câmera.
+
+        frame_wanted(camera_id), se informado, diz se a UI está pronta para outro frame;
+        quando retorna False o frame não é anotado nem entregue ao callback.
+        """
         if self.is_detection_active(camera_id):
             msg = f"Detecção já está ativa para Câmera {camera_id}."
             log_error("DetectionService", None, msg)
@@ -178,7 +528,7 @@ class DetectionService:
 
         session = DetectionSession(camera_id=camera_id, user=username, model_version=self.backend_name, cargo_type=cargo_type)
         stop_event = threading.Event()
-        thread = threading.Thread(target=self._run_detection_thread, args=(camera_id, session, camera_config, stop_event, callback), daemon=True, name=f"Detection-Cam-{camera_id}")
+        thread = threading.Thread(target=self._run_detection_thread, args=(camera_id, session, camera_config, stop_event, callback, frame_wanted), daemon=True, name=f"Detection-Cam-{camera_id}")
 
         self._active_sessions[camera_id] = session
         self._stop_events[camera_id] = stop_event
@@ -195,7 +545,8 @@ class DetectionService:
             session: DetectionSession,
             camera_config: CameraConfig,
             stop_event: threading.Event,
-            callback: Optional[Callable[[int, int, np.ndarray], None]]
+            callback: Optional[Callable[[int, int, np.ndarray], None]],
+            frame_wanted: Optional[Callable[[int], bool]] = None
     ) -> None:
         """Thread principal de detecção."""
         thread_name = threading.current_thread().name
@@ -203,6 +554,8 @@ class DetectionService:
         print(f"✅ [{thread_name}] Iniciada")
         print(f"   Backend: {self.backend_name}, Modelo: {self.selected_model_path}")
         cap = None;
+        capture = None
+        show_window = False
         model = None
         try:
             log_system_event(f"LOADING_MODEL: {thread_name}", camera_id);
@@ -211,134 +564,157 @@ class DetectionService:
             log_system_event(f"MODEL_LOADED: {thread_name}", camera_id);
             print(f"✅ [{thread_name}] Modelo carregado")
             source = camera_config.source;
+            cfg = self.config.config.detection
             log_system_event(f"CONNECTING_SOURCE: {thread_name}, Source='{source}'", camera_id);
             print(f"🔄 [{thread_name}] Conectando a '{source}'...")
             try:
                 webcam_index = int(source); cap = cv2.VideoCapture(webcam_index,
                                                                    cv2.CAP_DSHOW); is_webcam = True; connection_msg = f"Webcam Índice {webcam_index}"
             except ValueError:
-                cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG); is_webcam = False; connection_msg = f"Stream {source}"
+                cap = _open_stream(source, self.backend_name == "TensorRT", cfg.use_gstreamer)
+                is_webcam = False; connection_msg = f"Stream {source}"
             if not cap or not cap.isOpened(): raise ConnectionError(f"Falha ao abrir fonte: '{source}'")
             log_system_event(f"SOURCE_CONNECTED: {thread_name}, Source='{source}'", camera_id);
             print(f"✅ [{thread_name}] Conectado a {connection_msg}")
 
-            cfg = self.config.config.detection;
             linha_y_pos = max(0.0, min(1.0, cfg.count_line_position))
+            line_width_percent = max(0.0, min(1.0, cfg.count_line_width_percent))
+            cached_shape = None
+            linha_y_pixel = x_start = x_end = 0
             contador = 0
-            # --- MODIFICADO: Estado do Rastreador ---
-            # Guarda {'previous_fraction_below': Optional[float], 'counted_this_crossing_up': bool}
-            rastreador_estado: Dict[int, Dict[str, Any]] = {}
-            # --- FIM MODIFICAÇÃO ---
-            falhas_consecutivas = 0;
-            max_falhas = cfg.max_detection_failures
+            # Estado do rastreador em arrays por slot (fração anterior + já contado)
+            rastreador_estado = CrossingState()
+            # Inferência a cada `stride` frames; o ByteTrack mantém os IDs entre elas
+            stride = max(1, int(cfg.detection_stride))
+            frame_idx = 0
+            # Envio dos frames via memória pinned (apenas TensorRT/CUDA)
+            uploader = None
+            if cfg.cuda_pinned_upload and self.backend_name == "TensorRT" and torch.cuda.is_available():
+                uploader = CudaFrameUploader(cfg.imgsz)
+                print(f"   ⚡ [{thread_name}] Upload CUDA com memória pinned ({cfg.imgsz}px)")
+            # Forward traçado + ByteTrack independente (apenas modelos .pt)
+            traced = None
+            if cfg.traced_predictor and uploader is None and self.selected_model_path.endswith(".pt"):
+                traced = self._build_traced_tracker(model, cfg, thread_name)
+            # Contagem na GPU (TensorRT): só os IDs que cruzaram voltam para a CPU
+            gpu_state = None
+            if cfg.gpu_crossing and traced is None and self.backend_name == "TensorRT" and torch.cuda.is_available():
+                from ..utils.gpu_crossing import GpuCrossingState
+                gpu_state = GpuCrossingState(torch.device("cuda", 0))
+                print(f"   ⚡ [{thread_name}] Contagem por cruzamento na GPU")
+            ultimas_caixas = (np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.int64),
+                              np.empty(0, dtype=np.float32))
+            # Sem janela e sem callback ninguém consome o frame anotado
+            show_window = bool(cfg.show_window)  # Lido uma vez: o loop não consulta a config
+            desenhar = show_window or callback is not None
+            capture = _CaptureThread(cap, cfg.max_detection_failures, name=f"{thread_name}-Capture")
+            capture.start()
+            # Afinidade só depois do modelo e da thread de leitura existirem (não herdam o núcleo
+            # único) e só com inferência na GPU: na CPU, os pools do torch/OpenVINO ficariam num núcleo
+            if cfg.pin_detection_threads and self.backend_name in _GPU_BACKENDS:
+                core_id = _pin_current_thread(camera_id)
+                if core_id is not None: print(f"   Núcleo dedicado: {core_id}")
 
             self.trigger_ui_event("detection_started", camera_id);
             log_system_event(f"DETECTION_LOOP_STARTING: {thread_name}", camera_id);
             print(f"🎬 [{thread_name}] Iniciando loop...")
 
             while not stop_event.is_set():
-                if stop_event.is_set(): break
-                ret, frame = cap.read()
-                if stop_event.is_set(): break
-                if not ret or frame is None:
-                    falhas_consecutivas += 1
-                    if falhas_consecutivas > max_falhas: log_error(thread_name, None,
-                                                                   f"Stream perdido após {max_falhas} falhas."); self.trigger_ui_event(
-                        "detection_failed", camera_id, "Stream perdido"); break
-                    stop_event.wait(0.1);
+                if not capture.frame_ready.wait(0.1) and capture.is_alive(): continue
+                frame = capture.take()
+                if frame is None:
+                    if not capture.is_alive():  # Leitura encerrada (stream perdido ou erro)
+                        log_error(thread_name, None, f"Stream perdido após {cfg.max_detection_failures} falhas.")
+                        self.trigger_ui_event("detection_failed", camera_id, "Stream perdido"); break
                     continue
-                falhas_consecutivas = 0
                 if is_webcam: frame = cv2.flip(frame, 1)  # Inverte webcam
 
-                frame_height, frame_width = frame.shape[:2];
-                linha_y_pixel = int(frame_height * linha_y_pos)
-                line_width_percent = np.clip(cfg.count_line_width_percent, 0.0, 1.0);
-                line_pixel_width = frame_width * line_width_percent
-                x_start = int((frame_width - line_pixel_width) / 2);
-                x_end = int(x_start + line_pixel_width)
-
-                if stop_event.is_set(): break
-                track_args = {'conf': cfg.confidence_threshold, 'persist': True, 'verbose': False,
-                              'tracker': 'bytetrack.yaml'}
-                if self.selected_device_args: track_args.update(self.selected_device_args)
-                resultados = model.track(frame, **track_args)
-                if stop_event.is_set(): break
-
-                deteccoes = resultados[0].boxes if resultados and len(resultados) > 0 else None
-                frame_anotado = frame.copy();
-                current_ids_on_frame = set()
-
-                if deteccoes is not None and deteccoes.id is not None:
-                    frame_anotado = resultados[0].plot(line_width=1, font_size=0.4)
-                    for box, obj_id_tensor in zip(deteccoes.xyxy, deteccoes.id):
-                        obj_id = int(obj_id_tensor.cpu().item());
-                        current_ids_on_frame.add(obj_id)
-                        x1, y1, x2, y2 = map(int, box.cpu().numpy());
-                        cx = (x1 + x2) // 2;
-                        height = y2 - y1
-
-                        # --- LÓGICA DE CONTAGEM INVERTIDA ---
-                        if height > 0:
-                            pixels_below = max(0, y2 - linha_y_pixel)
-                            current_fraction_below = np.clip(pixels_below / height, 0.0, 1.0)
-
-                            # Inicializa estado se for a primeira vez vendo o ID
-                            if obj_id not in rastreador_estado:
-                                rastreador_estado[obj_id] = {'previous_fraction_below': None,
-                                                             'counted_this_crossing_up': False}
-
-                            state = rastreador_estado[obj_id]
-                            previous_fraction_below = state['previous_fraction_below']
-                            dentro_limites_x = (x_start <= cx <= x_end)
-
-                            # CONDIÇÃO DE CONTAGEM (BAIXO PARA CIMA):
-                            # 1. Visto antes?
-                            # 2. Estava >= 70% abaixo antes?
-                            # 3. Está < 70% abaixo agora?
-                            # 4. Não contado nesta subida?
-                            # 5. Dentro dos limites X?
-                            if (previous_fraction_below is not None and
-                                    previous_fraction_below >= CROSSING_THRESHOLD and  # Era >= 70%
-                                    current_fraction_below < CROSSING_THRESHOLD and  # Agora é < 70%
-                                    not state['counted_this_crossing_up'] and
-                                    dentro_limites_x):
-
-                                contador += 1
-                                state['counted_this_crossing_up'] = True  # Marca como contado nesta subida
-                                session.detection_count = contador
-                                log_system_event(f"OBJECT_CROSSED_UP: Cam={camera_id}, ID={obj_id}, Count={contador}",
-                                                 camera_id)
-                                print(
-                                    f"✅ [{thread_name}] ID {obj_id} CRUZOU PARA CIMA ({current_fraction_below:.2f} abaixo)! Total: {contador}")
-
-                            # CONDIÇÃO DE RESET DA CONTAGEM:
-                            # Se o objeto voltou a ter >= 70% abaixo,
-                            # ele pode ser contado novamente na próxima subida.
-                            elif current_fraction_below >= CROSSING_THRESHOLD:
-                                state['counted_this_crossing_up'] = False  # Permite contar na próxima subida
-
-                            # Atualiza estado para próximo frame
-                            state['previous_fraction_below'] = current_fraction_below
-                        # --- FIM DA LÓGICA INVERTIDA ---
-
-                # Limpa estado de IDs que saíram
-                ids_to_remove = set(rastreador_estado.keys()) - current_ids_on_frame
-                for tid in ids_to_remove: del rastreador_estado[tid]
-
-                # Desenha linha e contagem
+                if frame.shape[:2] != cached_shape:  # Só no primeiro frame ou se a resolução mudar
+                    cached_shape = frame.shape[:2]
+                    linha_y_pixel, x_start, x_end = _line_geometry(cached_shape, linha_y_pos, line_width_percent)
+
+                detectar = frame_idx % stride == 0
+                frame_idx += 1
+                if detectar:
+                    if traced is not None:
+                        xyxy, ids, confs = traced.track(frame)
+                    else:
+                        track_args = {'conf': cfg.confidence_threshold, 'persist': True, 'verbose': False,
+                                      'tracker': 'bytetrack.yaml'}
+                        if self.selected_device_args: track_args.update(self.selected_device_args)
+                        if uploader is not None:
+                            track_args['imgsz'] = cfg.imgsz
+                            resultados = model.track(uploader.upload(frame), **track_args)
+                        else:
+                            resultados = model.track(frame, **track_args)
+
+                        deteccoes = resultados[0].boxes if resultados and len(resultados) > 0 else None
+
+                        if gpu_state is not None:
+                            cruzados = []
+                            if deteccoes is not None and deteccoes.id is not None:
+                                xyxy_gpu = deteccoes.xyxy
+                                if uploader is not None:
+                                    xyxy_gpu = uploader.to_frame_coords_gpu(xyxy_gpu)
+                                cruzados = gpu_state.update(xyxy_gpu, deteccoes.id, linha_y_pixel, x_start,
+                                                            x_end, CROSSING_THRESHOLD)
+                                if desenhar:  # Caixas só vêm para a CPU se alguém for desenhá-las
+                                    ultimas_caixas = (xyxy_gpu.cpu().numpy().astype(np.int32),
+                                                      deteccoes.id.cpu().numpy().astype(np.int64),
+                                                      deteccoes.conf.cpu().numpy())
+                            else:
+                                gpu_state.skip()  # Frame sem detecções também conta para a expiração
+                                ultimas_caixas = (np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.int64),
+                                                  np.empty(0, dtype=np.float32))
+                        elif deteccoes is not None and deteccoes.id is not None:
+                            # Uma única cópia GPU->CPU por frame para todas as caixas
+                            xyxy = deteccoes.xyxy.cpu().numpy()
+                            ids = deteccoes.id.cpu().numpy().astype(np.int64)
+                            confs = deteccoes.conf.cpu().numpy()
+                            if uploader is not None:  # Caixas vêm no espaço do letterbox
+                                xyxy = uploader.to_frame_coords(xyxy)
+                            xyxy = xyxy.astype(np.int32)
+                        else:
+                            xyxy = np.empty((0, 4), dtype=np.int32)
+                            ids = np.empty(0, dtype=np.int64)
+                            confs = np.empty(0, dtype=np.float32)
+
+                    # --- LÓGICA DE CONTAGEM INVERTIDA ---
+                    # Conta quando o objeto passa de >= CROSSING_THRESHOLD abaixo da linha
+                    # para < CROSSING_THRESHOLD, dentro dos limites X, uma vez por subida.
+                    # IDs ausentes por mais de TRACK_GRACE_FRAMES são liberados em rastreador_estado.update().
+                    if gpu_state is None:
+                        ultimas_caixas = (xyxy, ids, confs)
+                        fractions, inside, valid = compute_line_metrics(xyxy, linha_y_pixel, x_start, x_end)
+                        cruzados = [(int(ids[idx]), float(fractions[idx])) for idx in
+                                    rastreador_estado.update(ids, fractions, inside, valid, CROSSING_THRESHOLD)]
+                    for obj_id, fracao in cruzados:
+                        contador += 1
+                        session.detection_count = contador
+                        session.crossing_times.append(time.time())
+                        log_system_event(f"OBJECT_CROSSED_UP: Cam={camera_id}, ID={obj_id}, Count={contador}",
+                                         camera_id)
+                        print(
+                            f"✅ [{thread_name}] ID {obj_id} CRUZOU PARA CIMA ({fracao:.2f} abaixo)! Total: {contador}")
+                    # --- FIM DA LÓGICA INVERTIDA ---
+
+                # A UI ainda está exibindo o frame anterior: não anota nem entrega este
+                enviar_ui = callback is not None and (frame_wanted is None or frame_wanted(camera_id))
+                if not (show_window or enviar_ui): continue
+
+                # Desenha caixas (as últimas inferidas, em frames intermediários), linha e contagem
+                frame_anotado = frame
+                _draw_boxes(frame_anotado, *ultimas_caixas)
                 cv2.line(frame_anotado, (x_start, linha_y_pixel), (x_end, linha_y_pixel), (0, 0, 255), 2)
                 cv2.putText(frame_anotado, f"Contagem: {contador}", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0),
                             2, cv2.LINE_AA)
 
-                if stop_event.is_set(): break
-                if callback:
+                if enviar_ui:
                     try:
                         callback(camera_id, contador, frame_anotado)
                     except Exception as e:
                         log_error(thread_name, e, f"Erro no callback")
-                if cfg.show_window:
-                    cv2.imshow(f"Camera {camera_id} - {self.backend_name}", frame_anotado)
-                    if cv2.waitKey(1) & 0xFF == ord('q'): stop_event.set(); break
+                if show_window: self._display.submit(camera_id, frame_anotado)
 
         except ConnectionError as conn_e:
             log_error(thread_name, conn_e, "Erro de conexão RTSP/Webcam");
@@ -349,17 +725,16 @@ class DetectionService:
         finally:
             log_system_event(f"CLEANING_UP_THREAD: {thread_name}", camera_id);
             print(f"🧹 [{thread_name}] Limpando recursos...")
-            try:  # Libera câmera
-                if cap is not None and cap.isOpened(): cap.release(); log_system_event(
-                    f"SOURCE_RELEASED: {thread_name}", camera_id)
-            except Exception as cap_e:
-                log_error(thread_name, cap_e, "Erro ao liberar captura de vídeo")
-            try:  # Fecha janela OpenCV
-                cfg = self.config.config.detection  # Garante que cfg esteja definida
-                if cfg.show_window: cv2.waitKey(10); cv2.destroyWindow(
-                    f"Camera {camera_id} - {self.backend_name}"); cv2.waitKey(10)
-            except Exception as win_e:
-                log_error(thread_name, win_e, "Erro ao fechar janela OpenCV")
+            if capture is not None:  # A thread de leitura libera a câmera ao sair
+                if not capture.stop():
+                    log_error(thread_name, None, f"Thread {capture.name} presa na leitura após o timeout; a captura será liberada quando ela sair")
+            else:
+                try:  # Libera câmera (aberta, mas a leitura não chegou a iniciar)
+                    if cap is not None and cap.isOpened(): cap.release(); log_system_event(
+                        f"SOURCE_RELEASED: {thread_name}", camera_id)
+                except Exception as cap_e:
+                    log_error(thread_name, cap_e, "Erro ao liberar captura de vídeo")
+            if show_window: self._display.remove(camera_id)  # A janela fecha sem câmeras
             if session.end_time is None: session.end_session()  # Garante end_time
             log_system_event(f"DETECTION_THREAD_ENDED: {thread_name}", camera_id);
             print(f"❌ [{thread_name}] Encerrada. Total: {session.detection_count}")
@@ -387,6 +762,12 @@ class DetectionService:
         if stopped_cleanly: self.trigger_ui_event("detection_stopped", camera_id) # Notifica UI
         return stopped_cleanly
 
+    def signal_stop(self, camera_ids: list[int]) -> None:
+        """Só sinaliza a parada (sem aguardar): um stop_detection em seguida encontra a thread já encerrando"""
+        for camera_id in camera_ids:
+            stop_event = self._stop_events.get(camera_id)
+            if stop_event: stop_event.set()
+
     def stop_all_detections(self) -> None:
         camera_ids = list(self._detection_threads.keys())
         if not camera_ids: log_system_event("STOP_ALL_DETECTIONS: Nenhuma detecção ativa."); return
@@ -410,7 +791,7 @@ class DetectionService:
     def reset_count(self, camera_id: int) -> bool:
         session = self._active_sessions.get(camera_id)
         if session:
-            session.detection_count = 0; print(f"⚠️ [{threading.current_thread().name}] Contagem resetada para Cam {camera_id}, mas estado interno da thread pode não ter sido limpo.")
+            session.detection_count = 0; session.crossing_times.clear(); print(f"⚠️ [{threading.current_thread().name}] Contagem resetada para Cam {camera_id}, mas estado interno da thread pode não ter sido limpo.")
             log_system_event(f"COUNT_RESET_CAMERA_{camera_id}", camera_id); self.trigger_ui_event("count_reset", camera_id); return True
         log_error("DetectionService", None, f"Tentativa de resetar contagem para câmera inativa: {camera_id}"); return False
     def get_session(self, camera_id: int) -> Optional[DetectionSession]:
@@ -2,25 +2,29 @@
 Serviço de geração de relatórios
 """
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict
+from types import SimpleNamespace
+from typing import Iterator, List, Optional, Tuple
 
 # Imports do ReportLab
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, Flowable
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 # --- CORREÇÃO AQUI ---
 from reportlab.lib.units import cm, inch # Adiciona inch
 # --- FIM CORREÇÃO ---
 from reportlab.pdfgen import canvas # Importa canvas para generate_simple_pdf
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from PIL import Image as PILImage
+import numpy as np
 
 # Imports do seu projeto
 from ..models.entities import DetectionSession, DetectionEvent, ReportData, DailyReport
-from ..utils.logger import log_system_event, log_error, log_user_action
+from ..utils.logger import log_system_event, log_error, log_user_action, configure_worker_logging
 from ..config.settings import config_manager
+from ..utils.fast_aggregates import compute_session_aggregates
 
 # --- Constantes de Estilo ---
 COLOR_PRIMARY = colors.HexColor("#4A90A4")
@@ -32,6 +36,219 @@ COLOR_LIGHT_GREY = colors.HexColor("#BDC3C7")
 COLOR_TABLE_HEADER_BG = colors.HexColor("#34495E")
 COLOR_TABLE_GRID = colors.lightgrey
 COLOR_WHITE = colors.white
+LOGO_PATH = "logo.png"
+LOGO_MAX_W = 3*cm
+LOGO_MAX_H = 1.5*cm
+
+
+# Layout fixo da página do relatório diário (mesmos campos usados por _add_page_elements)
+_PAGE_LAYOUT = SimpleNamespace(pagesize=A4, leftMargin=1.5*cm, rightMargin=1.5*cm, topMargin=2.5*cm, bottomMargin=2.0*cm)
+TABLE_LABEL_WIDTH = 4*cm
+TABLE_ROW_HEIGHT = 0.85*cm
+TABLE_PADDING = 8
+SUMMARY_LABELS = ('Câmera:', 'Tipo de Carga:', 'Início da Sessão:', 'Fim da Sessão:', 'Duração Total:', 'Contagem Total:')
+# Geometria fixa do relatório diário (título, subtítulo e tabela de resumo)
+_TITLE_Y = A4[1] - _PAGE_LAYOUT.topMargin - 20
+_SUBHEADER_Y = _TITLE_Y - 1.8*cm
+_TABLE_TOP = _SUBHEADER_Y - 0.4*cm
+_TABLE_BOTTOM = _TABLE_TOP - TABLE_ROW_HEIGHT * len(SUMMARY_LABELS)
+_TABLE_X = (_PAGE_LAYOUT.leftMargin, _PAGE_LAYOUT.leftMargin + TABLE_LABEL_WIDTH, A4[0] - _PAGE_LAYOUT.rightMargin)
+_ROW_BASELINES = tuple(_TABLE_TOP - TABLE_ROW_HEIGHT * (i + 1) + (TABLE_ROW_HEIGHT - 10) / 2 + 2
+                       for i in range(len(SUMMARY_LABELS)))
+_VALUE_MAX_WIDTH = _TABLE_X[2] - _TABLE_X[1] - 2 * TABLE_PADDING  # Largura útil da coluna de valores
+VALUE_MIN_FONT_SIZE = 7  # Valores longos (ex.: nome da câmera) encolhem até aqui e depois são cortados
+RATE_BUCKETS = 24  # Faixas de tempo do histograma de contagens
+RATE_CHART_HEIGHT = 3*cm
+
+
+LogoInfo = Tuple[str, float, float]  # (caminho, largura, altura) já escalados
+
+
+def _probe_logo(logo_path: str = LOGO_PATH) -> Optional[LogoInfo]:
+    """Lê o tamanho do logo uma única vez (PIL) e calcula a escala para o cabeçalho"""
+    try:
+        if Path(logo_path).exists():
+            with PILImage.open(logo_path) as img: img_w, img_h = img.size
+            ratio = min(LOGO_MAX_W / img_w, LOGO_MAX_H / img_h) if img_w > 0 and img_h > 0 else 1
+            return logo_path, img_w * ratio, img_h * ratio
+    except Exception as e:
+        log_error("ReportService", e, f"Logo inválido: {logo_path}")
+    return None
+
+
+def _page_context(doc) -> SimpleNamespace:
+    """Posições fixas do cabeçalho/rodapé para um layout de página (calculadas uma vez)"""
+    page_width, page_height = doc.pagesize
+    return SimpleNamespace(
+        logo_x=doc.leftMargin, logo_top=page_height - doc.topMargin + 0.5*cm,
+        date_x=page_width - doc.rightMargin, date_y=page_height - doc.topMargin + 0.5*cm,
+        footer_x=page_width / 2.0, footer_y=doc.bottomMargin / 2.0,
+    )
+
+
+_PAGE_CTX = _page_context(_PAGE_LAYOUT)
+
+
+def _add_page_elements(canvas, doc, logo: Optional[LogoInfo] = None):
+    """Adiciona cabeçalho (logo, data) e rodapé (nome, página) em cada página"""
+    ctx = _PAGE_CTX if doc is _PAGE_LAYOUT else _page_context(doc)
+    canvas.saveState()
+    try: # Logo (drawImage do ReportLab reaproveita a imagem já carregada pelo nome do arquivo)
+        if logo is not None:
+            logo_path, logo_w, logo_h = logo
+            canvas.drawImage(logo_path, ctx.logo_x, ctx.logo_top - logo_h, width=logo_w, height=logo_h, mask='auto')
+    except Exception: pass
+    # Só a data/hora e o número da página mudam de uma página para outra
+    canvas.setFont('Helvetica', 8); canvas.setFillColor(COLOR_GREY)
+    canvas.drawRightString(ctx.date_x, ctx.date_y, f"Gerado em: {datetime.now():%d/%m/%Y %H:%M:%S}")
+    canvas.drawCentredString(ctx.footer_x, ctx.footer_y,
+                             f"LAS Cams System v2.0 | Contagem Automática | Página {canvas.getPageNumber()}")
+    canvas.restoreState()
+
+
+class _FilenameTable(dict):
+    """Tabela para str.translate: mantém alfanuméricos e troca o resto por '_'"""
+
+    def __missing__(self, code: int) -> int:
+        # Caracteres fora do ASCII pré-calculado: decide e guarda na primeira vez
+        value = self[code] = code if chr(code).isalnum() else ord("_")
+        return value
+
+
+_FNAME_TABLE = _FilenameTable((i, i if chr(i).isalnum() else ord("_")) for i in range(128))
+
+
+def _default_report_filename(report_data: DailyReport) -> str:
+    """Nome padrão do PDF: câmera (só caracteres seguros) + início da sessão"""
+    ts = report_data.horaInicio.strftime("%Y%m%d_%H%M%S")
+    safe_cam_name = report_data.camera_name.translate(_FNAME_TABLE)
+    return f"Relatorio_{safe_cam_name}_{ts}.pdf"
+
+
+def _draw_rate_summary(c, report_data: DailyReport, y: float, x_left: float, x_right: float) -> None:
+    """Bloco 'Ritmo de Contagem': intervalos entre contagens e histograma por faixa de tempo"""
+    mean_interval, min_interval, histogram = compute_session_aggregates(
+        np.asarray(report_data.crossing_times), report_data.horaInicio.timestamp(),
+        report_data.horaTermino.timestamp(), RATE_BUCKETS
+    )
+    c.setFont('Helvetica-Bold', 14); c.setFillColor(COLOR_PRIMARY)
+    c.drawString(x_left, y, "Ritmo de Contagem")
+    y -= 0.7*cm
+    bucket_minutes = report_data.totalHoras * 60 / RATE_BUCKETS
+    c.setFont('Helvetica', 10); c.setFillColor(COLOR_TEXT_DARK)
+    c.drawString(x_left, y, f"Intervalo médio entre contagens: {mean_interval:.1f} s   |   Menor intervalo: {min_interval:.1f} s")
+    y -= 0.5*cm
+    c.drawString(x_left, y, f"Pico: {int(histogram.max())} contagens em {bucket_minutes:.1f} min")
+
+    # Histograma (uma barra por faixa de tempo da sessão)
+    peak = max(int(histogram.max()), 1)
+    chart_bottom = y - 0.4*cm - RATE_CHART_HEIGHT
+    bar_w = (x_right - x_left) / RATE_BUCKETS
+    c.setFillColor(COLOR_PRIMARY)
+    for i, count in enumerate(histogram.tolist()):
+        if count:
+            c.rect(x_left + i * bar_w + 1, chart_bottom, bar_w - 2, RATE_CHART_HEIGHT * count / peak, stroke=0, fill=1)
+    c.setStrokeColor(COLOR_LIGHT_GREY); c.setLineWidth(0.5)
+    c.line(x_left, chart_bottom, x_right, chart_bottom)
+
+
+def _fit_text(text: str, font: str, size: float, max_width: float) -> Tuple[str, float]:
+    """Reduz a fonte até VALUE_MIN_FONT_SIZE e, se ainda não couber, corta o texto com reticências"""
+    while size > VALUE_MIN_FONT_SIZE and stringWidth(text, font, size) > max_width:
+        size -= 1
+    if stringWidth(text, font, size) <= max_width:
+        return text, size
+    ellipsis_width = stringWidth("…", font, size)
+    while text and stringWidth(text, font, size) + ellipsis_width > max_width:
+        text = text[:-1]
+    return text + "…", size
+
+
+def _iter_summary_values(report_data: DailyReport) -> Iterator[str]:
+    """Gera os valores da tabela de resumo sob demanda (mesma ordem de SUMMARY_LABELS)"""
+    yield report_data.camera_name
+    yield report_data.tipo.value
+    yield report_data.horaInicio.strftime("%d/%m/%Y %H:%M:%S")
+    yield report_data.horaTermino.strftime("%H:%M:%S")
+    duration_delta = report_data.horaTermino - report_data.horaInicio
+    hours, remainder = divmod(int(max(0, duration_delta.total_seconds())), 3600) # Garante não negativo
+    minutes, seconds = divmod(remainder, 60)
+    yield f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    yield str(report_data.total)
+
+
+def _draw_report_chrome(c) -> None:
+    """Parte fixa do relatório diário: título, subtítulo, coluna de rótulos e grade da tabela"""
+    page_width = A4[0]
+    c.saveState()
+    c.setFont('Helvetica-Bold', 20); c.setFillColor(COLOR_SECONDARY)
+    c.drawCentredString(page_width / 2.0, _TITLE_Y, "Relatório de Sessão de Contagem")
+    c.setFont('Helvetica-Bold', 14); c.setFillColor(COLOR_PRIMARY)
+    c.drawString(_TABLE_X[0], _SUBHEADER_Y, "Resumo da Sessão")
+    c.setFillColor(COLOR_TABLE_HEADER_BG)
+    c.rect(_TABLE_X[0], _TABLE_BOTTOM, TABLE_LABEL_WIDTH, _TABLE_TOP - _TABLE_BOTTOM, stroke=0, fill=1)
+    c.setFont('Helvetica-Bold', 10); c.setFillColor(COLOR_TEXT_LIGHT)
+    for label, baseline in zip(SUMMARY_LABELS, _ROW_BASELINES):
+        c.drawString(_TABLE_X[0] + TABLE_PADDING, baseline, label)
+    c.setStrokeColor(COLOR_LIGHT_GREY); c.setLineWidth(0.5)
+    c.grid(list(_TABLE_X), [_TABLE_TOP - TABLE_ROW_HEIGHT * i for i in range(len(SUMMARY_LABELS) + 1)])
+    c.restoreState()
+
+
+def _write_pdf_atomic(filepath: str, data: bytes) -> None:
+    """Grava o PDF montado em memória num único write, via arquivo temporário + replace (sem PDF pela metade)"""
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+
+
+def _render_daily_report(
+        report_data: DailyReport,
+        reports_dir: str,
+        filename: Optional[str] = None,
+        logo: Optional[LogoInfo] = None
+) -> str:
+    """
+    Desenha o PDF de uma sessão direto no canvas e retorna o caminho gerado.
+
+    O conteúdo é fixo (título + tabela de 6 linhas, sempre uma página), então as
+    coordenadas são pré-calculadas em vez de passar pelo layout do Platypus.
+    Função pura de módulo (sem estado da instância) para poder rodar em outro
+    processo; erros são propagados para quem chamou registrar.
+    """
+    filepath = os.path.join(reports_dir, filename or _default_report_filename(report_data))
+    c = canvas.Canvas(filepath, pagesize=A4)
+
+    _draw_report_chrome(c)
+    c.setFillColor(COLOR_TEXT_DARK)
+    last_row = len(SUMMARY_LABELS) - 1
+    for i, (value, baseline) in enumerate(zip(_iter_summary_values(report_data), _ROW_BASELINES)):
+        font = 'Helvetica-Bold' if i == last_row else 'Helvetica'  # Contagem total em negrito
+        value, size = _fit_text(value, font, 10, _VALUE_MAX_WIDTH)  # Sem Paragraph: não quebra linha
+        c.setFont(font, size)
+        c.drawString(_TABLE_X[1] + TABLE_PADDING, baseline, value)
+
+    if report_data.crossing_times:
+        _draw_rate_summary(c, report_data, _TABLE_BOTTOM - 0.8*cm, _TABLE_X[0], _TABLE_X[2])
+
+    _add_page_elements(c, _PAGE_LAYOUT, logo)
+    c.showPage()
+    _write_pdf_atomic(filepath, c.getpdfdata())
+    return filepath
+
+
+def _render_daily_report_item(
+        args: Tuple[DailyReport, str, Optional[str], Optional[LogoInfo]]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Adaptador para ProcessPoolExecutor.map (um argumento por item). Retorna
+    (caminho, None) ou (None, traceback): o processo principal registra o erro.
+    """
+    try:
+        return _render_daily_report(*args), None
+    except Exception:
+        return None, traceback.format_exc()
 
 
 class ReportService:
@@ -46,107 +263,66 @@ class ReportService:
         else:
              self.reports_dir = Path(reports_dir)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
-        self.styles = self._setup_styles()
-        log_system_event(f"REPORT_SERVICE_INITIALIZED: Directory={self.reports_dir.resolve()}")
-
-    def _setup_styles(self) -> Dict[str, ParagraphStyle]:
-        """Define estilos de parágrafo para o relatório"""
-        base_styles = getSampleStyleSheet()
-        styles = {
-            'Title': ParagraphStyle(name='Title', parent=base_styles['h1'], fontSize=20, alignment=TA_CENTER, spaceAfter=1*cm, textColor=COLOR_SECONDARY),
-            'HeaderInfo': ParagraphStyle(name='HeaderInfo', parent=base_styles['Normal'], fontSize=9, alignment=TA_RIGHT, textColor=COLOR_GREY, rightIndent=0.5*cm),
-            'SubHeader': ParagraphStyle(name='SubHeader', parent=base_styles['h2'], fontSize=14, alignment=TA_LEFT, spaceBefore=0.8*cm, spaceAfter=0.4*cm, textColor=COLOR_PRIMARY, borderPadding=(2, 2, 4, 2)),
-            'BodyText': ParagraphStyle(name='BodyText', parent=base_styles['Normal'], fontSize=10, alignment=TA_LEFT, spaceAfter=3, textColor=COLOR_TEXT_DARK),
-            'Footer': ParagraphStyle(name='Footer', parent=base_styles['Normal'], fontSize=8, alignment=TA_CENTER, textColor=COLOR_GREY),
-            'TableCellLabel': ParagraphStyle(name='TableCellLabel', parent=base_styles['Normal'], fontSize=10, alignment=TA_LEFT, textColor=COLOR_TEXT_LIGHT, fontName='Helvetica-Bold'),
-            'TableCellValue': ParagraphStyle(name='TableCellValue', parent=base_styles['Normal'], fontSize=10, alignment=TA_LEFT, textColor=COLOR_TEXT_DARK),
-            'TableCellValueBold': ParagraphStyle(name='TableCellValueBold', parent=base_styles['Normal'], fontSize=10, alignment=TA_LEFT, textColor=COLOR_TEXT_DARK, fontName='Helvetica-Bold'),
-        }
-        return styles
-
-    def _add_page_elements(self, canvas, doc):
-        """Adiciona cabeçalho (logo, data) e rodapé (nome, página) em cada página"""
-        canvas.saveState()
-        page_width = doc.pagesize[0]; page_height = doc.pagesize[1]
-        try: # Logo
-            logo_path = "logo.png"
-            if Path(logo_path).exists():
-                max_logo_w = 3*cm; max_logo_h = 1.5*cm
-                img = Image(logo_path); img_w, img_h = img._img.getSize()
-                ratio = min(max_logo_w / img_w, max_logo_h / img_h) if img_w > 0 and img_h > 0 else 1
-                logo_w, logo_h = img_w * ratio, img_h * ratio
-                canvas.drawImage(logo_path, doc.leftMargin, page_height - doc.topMargin - logo_h + 0.5*cm, width=logo_w, height=logo_h, mask='auto')
-        except Exception: pass
-        now = datetime.now().strftime("%d/%m/%Y %H:%M:%S") # Data/Hora Geração
-        canvas.setFont('Helvetica', 8); canvas.setFillColor(COLOR_GREY)
-        canvas.drawRightString(page_width - doc.rightMargin, page_height - doc.topMargin + 0.5*cm, f"Gerado em: {now}")
-        page_num = canvas.getPageNumber() # Rodapé
-        text = f"LAS Cams System v2.0 | Contagem Automática | Página {page_num}"
-        canvas.setFont('Helvetica', 8); canvas.setFillColor(COLOR_GREY)
-        canvas.drawCentredString(page_width / 2.0, doc.bottomMargin / 2.0, text)
-        canvas.restoreState()
+        self._reports_path = str(self.reports_dir.resolve())  # Caminho absoluto em str, resolvido uma vez
+        self._logo = _probe_logo()  # Verificado uma vez; passado (picklable) para cada renderização
+        log_system_event(f"REPORT_SERVICE_INITIALIZED: Directory={self._reports_path}")
 
     def generate_daily_report(
             self,
             report_data: DailyReport,
             filename: Optional[str] = None
         ) -> Optional[str]:
-        """Gera um relatório PDF aprimorado para uma sessão usando Platypus."""
-        if filename is None:
-            ts = report_data.horaInicio.strftime("%Y%m%d_%H%M%S")
-            safe_cam_name = "".join(c if c.isalnum() else "_" for c in report_data.camera_name)
-            filename = f"Relatorio_{safe_cam_name}_{ts}.pdf"
-        filepath = self.reports_dir / filename
+        """Gera um relatório PDF aprimorado para uma sessão (desenho direto no canvas)."""
+        filename = filename or _default_report_filename(report_data)
+        filepath = os.path.join(self._reports_path, filename)
         log_system_event(f"GENERATING_ENHANCED_REPORT: {filepath}")
-
         try:
-            doc = SimpleDocTemplate(str(filepath), pagesize=A4, leftMargin=1.5*cm, rightMargin=1.5*cm, topMargin=2.5*cm, bottomMargin=2.0*cm)
-            Story: List[Flowable] = []
-            Story.append(Paragraph("Relatório de Sessão de Contagem", self.styles['Title']))
-            Story.append(Paragraph("Resumo da Sessão", self.styles['SubHeader']))
-
-            start_time_str = report_data.horaInicio.strftime("%d/%m/%Y %H:%M:%S")
-            end_time_str = report_data.horaTermino.strftime("%H:%M:%S")
-            duration_delta = report_data.horaTermino - report_data.horaInicio
-            hours, remainder = divmod(int(max(0, duration_delta.total_seconds())), 3600) # Garante não negativo
-            minutes, seconds = divmod(remainder, 60)
-            duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-            table_data = [
-                [Paragraph('Câmera:', self.styles['TableCellLabel']), Paragraph(report_data.camera_name, self.styles['TableCellValue'])],
-                [Paragraph('Tipo de Carga:', self.styles['TableCellLabel']), Paragraph(report_data.tipo.value, self.styles['TableCellValue'])],
-                [Paragraph('Início da Sessão:', self.styles['TableCellLabel']), Paragraph(start_time_str, self.styles['TableCellValue'])],
-                [Paragraph('Fim da Sessão:', self.styles['TableCellLabel']), Paragraph(end_time_str, self.styles['TableCellValue'])],
-                [Paragraph('Duração Total:', self.styles['TableCellLabel']), Paragraph(duration_str, self.styles['TableCellValue'])],
-                [Paragraph('Contagem Total:', self.styles['TableCellLabel']), Paragraph(str(report_data.total), self.styles['TableCellValueBold'])],
-            ]
-            table = Table(table_data, colWidths=[4*cm, None])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), COLOR_TABLE_HEADER_BG),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('GRID', (0, 0), (-1, -1), 0.5, COLOR_LIGHT_GREY),
-                ('TOPPADDING', (0, 0), (-1, -1), 6), ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8), ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            Story.append(table)
-            Story.append(Spacer(1, 1*cm))
-
-            doc.build(Story, onFirstPage=self._add_page_elements, onLaterPages=self._add_page_elements)
+            _render_daily_report(report_data, self._reports_path, filename, self._logo)
             log_system_event(f"ENHANCED_REPORT_GENERATED: {filepath}")
-            return str(filepath)
+            return filepath
         except Exception as e:
             log_error("ReportService", e, f"Erro crítico ao gerar relatório PDF aprimorado: {filepath}")
             return None
 
+    def generate_daily_reports_bulk(
+            self,
+            items: List[DailyReport],
+            max_workers: Optional[int] = None
+        ) -> List[Optional[str]]:
+        """
+        Gera vários relatórios em paralelo, um processo por núcleo.
+
+        Returns:
+            Caminhos gerados, na mesma ordem de `items` (None para os que falharam).
+        """
+        if not items:
+            return []
+        jobs = [(report_data, self._reports_path, None, self._logo) for report_data in items]
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        log_system_event(f"GENERATING_REPORTS_BULK: {len(jobs)} relatórios, {workers} processos")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=configure_worker_logging) as executor:
+                outcomes = list(executor.map(_render_daily_report_item, jobs))
+        except Exception as e:
+            log_error("ReportService", e, "Erro no pool de processos; gerando relatórios em sequência")
+            outcomes = [_render_daily_report_item(job) for job in jobs]
+        results = [path for path, _ in outcomes]
+        for report_data, (path, error_text) in zip(items, outcomes):
+            if path is None:
+                log_error("ReportService", None,
+                          f"Falha ao gerar relatório da câmera {report_data.camera_name}:\n{error_text}")
+        log_system_event(f"REPORTS_BULK_GENERATED: {sum(r is not None for r in results)}/{len(results)}")
+        return results
+
     def generate_simple_pdf(self, user: str, camera_id: int, session: DetectionSession) -> Optional[str]:
         """Gera relatório simples em PDF (compatibilidade ou fallback)"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"Relatorio_Simples_Cam{camera_id}_{timestamp}.pdf"
-            filepath = self.reports_dir / filename
+            filepath = os.path.join(self._reports_path, filename)
 
             # Usa a instância de canvas importada
-            c = canvas.Canvas(str(filepath), pagesize=A4)
+            c = canvas.Canvas(filepath, pagesize=A4)
             width, height = A4
 
             # Título Simples
@@ -174,10 +350,10 @@ class ReportService:
             textobject.textLine(f"Contagem Total: {session.detection_count}")
 
             c.drawText(textobject)
-            c.save()
+            _write_pdf_atomic(filepath, c.getpdfdata())
 
             log_system_event(f"SIMPLE_REPORT_GENERATED: {filepath}")
-            return str(filepath)
+            return filepath
         except Exception as e:
             log_error("ReportService", e, f"Erro ao gerar relatório PDF simples para câmera {camera_id}")
             return None
@@ -185,20 +361,25 @@ class ReportService:
     def get_reports_list(self) -> List[dict]:
         """Retorna lista de relatórios gerados (arquivos PDF)"""
         reports = []
+        fromtimestamp = datetime.fromtimestamp
         try:
-            for file_path in self.reports_dir.glob("*.pdf"):
-                try:
-                    stat = file_path.stat()
-                    reports.append({
-                        'filename': file_path.name,
-                        'filepath': str(file_path.resolve()),
-                        'size_kb': round(stat.st_size / 1024, 2),
-                        'created': datetime.fromtimestamp(stat.st_ctime),
-                        'modified': datetime.fromtimestamp(stat.st_mtime)
-                    })
-                except Exception as file_e:
-                     log_error("ReportService", file_e, f"Erro ao processar arquivo de relatório: {file_path.name}")
-                     continue
+            # scandir traz o stat junto da listagem do diretório (menos syscalls que glob + stat)
+            with os.scandir(self._reports_path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".pdf"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                        reports.append({
+                            'filename': entry.name,
+                            'filepath': entry.path,
+                            'size_kb': round(stat.st_size / 1024, 2),
+                            'created': fromtimestamp(stat.st_ctime),
+                            'modified': fromtimestamp(stat.st_mtime)
+                        })
+                    except Exception as file_e:
+                         log_error("ReportService", file_e, f"Erro ao processar arquivo de relatório: {entry.name}")
+                         continue
         except Exception as e:
             log_error("ReportService", e, f"Erro ao listar diretório de relatórios: {self.reports_dir}")
         return sorted(reports, key=lambda x: x['created'], reverse=True)
@@ -206,14 +387,12 @@ class ReportService:
     def delete_report(self, filename: str) -> bool:
         """Remove um arquivo de relatório pelo nome"""
         try:
-            file_path = self.reports_dir / filename
-            if file_path.exists() and file_path.is_file():
-                file_path.unlink()
-                log_system_event(f"REPORT_DELETED: {filename}")
-                return True
-            else:
-                 log_error("ReportService", None, f"Tentativa de deletar relatório não encontrado: {filename}")
-                 return False
+            os.unlink(os.path.join(self._reports_path, filename))  # Uma syscall; falha se não existir
+            log_system_event(f"REPORT_DELETED: {filename}")
+            return True
+        except FileNotFoundError:
+            log_error("ReportService", None, f"Tentativa de deletar relatório não encontrado: {filename}")
+            return False
         except Exception as e:
             log_error("ReportService", e, f"Erro ao deletar relatório {filename}")
             return False
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Lógica de contagem por cruzamento de linha (baixo para cima)
+
+O estado de cada ID do rastreador fica em arrays NumPy paralelos indexados por
+um slot compacto, e a atualização por frame é compilada com Numba quando disponível.
+"""
+from typing import Dict, List, Tuple
+import numpy as np
+
+from .jit import njit
+
+MAX_TRACKS = 256  # Slots preallocados (cresce só se houver mais IDs ativos)
+TRACK_GRACE_FRAMES = 5  # Atualizações sem ver o ID antes de liberar o slot
+
+
+@njit("Tuple((int64, float32[:], boolean[:], int64[:]))"
+      "(int64[:], float32[:], boolean[:], float32[:], boolean[:], float32)", nogil=True, cache=True)
+def _update_crossings(ids, fractions, inside, prev_fraction, counted, threshold):
+    """
+    Atualiza o estado de cruzamento para as detecções do frame.
+
+    Args:
+        ids: Slot de estado de cada detecção.
+        fractions: Fração da caixa abaixo da linha (0 a 1).
+        inside: Se o centro X da caixa está dentro dos limites da linha.
+        prev_fraction: Fração no frame anterior, por slot (NaN = nunca visto).
+        counted: Se o slot já foi contado nesta subida.
+        threshold: Limiar de fração para o cruzamento.
+
+    Returns:
+        (novas contagens, prev_fraction, counted, índices das detecções que cruzaram)
+    """
+    n = ids.shape[0]
+    cross_indices = np.empty(n + 1, dtype=np.int64)
+    new_count_delta = 0
+    for i in range(n):
+        slot = ids[i]
+        current = fractions[i]
+        below = current < threshold
+        # NaN (ID novo) nunca satisfaz a comparação, igual ao "não visto antes"
+        crossed = (prev_fraction[slot] >= threshold) & below & (not counted[slot]) & inside[i]
+        # Sem desvios: zera ao voltar abaixo do limiar (permite a próxima subida), marca ao cruzar
+        counted[slot] = (counted[slot] & below) | crossed
+        prev_fraction[slot] = current
+        # Compactação sem desvio: escreve sempre, avança só se cruzou
+        cross_indices[new_count_delta] = i
+        new_count_delta += crossed
+    return new_count_delta, prev_fraction, counted, cross_indices[:new_count_delta]
+
+
+def compute_line_metrics(
+        xyxy: np.ndarray,
+        line_y: int,
+        x_start: int,
+        x_end: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula, para todas as caixas de uma vez, a fração abaixo da linha,
+    se o centro está dentro dos limites X e se a caixa tem altura válida.
+    """
+    x1, y1, x2, y2 = xyxy[:, 0], xyxy[:, 1], xyxy[:, 2], xyxy[:, 3]
+    heights = y2 - y1
+    valid = heights > 0
+    pixels_below = np.maximum(y2 - line_y, 0)
+    fractions = np.clip(pixels_below / np.maximum(heights, 1), 0.0, 1.0).astype(np.float32)
+    cx = (x1 + x2) // 2
+    inside = (cx >= x_start) & (cx <= x_end)
+    return fractions, inside, valid
+
+
+class CrossingState:
+    """
+    Estado de cruzamento por ID do rastreador, em arrays (SoA) indexados por slot.
+
+    Um slot só é liberado depois de `grace_frames` atualizações sem ver o ID,
+    para que uma oclusão curta não apague o estado do objeto.
+    """
+
+    def __init__(self, capacity: int = MAX_TRACKS, grace_frames: int = TRACK_GRACE_FRAMES):
+        self.prev_fraction = np.full(capacity, np.nan, dtype=np.float32)
+        self.counted = np.zeros(capacity, dtype=np.bool_)
+        self.last_seen = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=np.bool_)
+        self.track_id = np.full(capacity, -1, dtype=np.int64)
+        self.grace_frames = grace_frames
+        self.frame_idx = 0
+        self._slot_by_id: Dict[int, int] = {}
+        self._free_slots: List[int] = list(range(capacity - 1, -1, -1))
+
+    def _grow(self) -> None:
+        """Dobra a capacidade dos arrays de estado (só se houver mais de `capacity` IDs ativos)"""
+        old_capacity = self.prev_fraction.shape[0]
+        new_capacity = old_capacity * 2
+        self.prev_fraction = np.resize(self.prev_fraction, new_capacity)
+        self.counted = np.resize(self.counted, new_capacity)
+        self.last_seen = np.resize(self.last_seen, new_capacity)
+        self.active = np.resize(self.active, new_capacity)
+        self.active[old_capacity:] = False
+        self.track_id = np.resize(self.track_id, new_capacity)
+        self._free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def _slots_for(self, ids: np.ndarray) -> np.ndarray:
+        """Mapeia IDs do rastreador para slots, alocando slots para IDs novos"""
+        slots = np.empty(ids.shape[0], dtype=np.int64)
+        for i, obj_id in enumerate(ids.tolist()):
+            slot = self._slot_by_id.get(obj_id)
+            if slot is None:
+                if not self._free_slots:
+                    self._grow()
+                slot = self._free_slots.pop()
+                self.prev_fraction[slot] = np.nan
+                self.counted[slot] = False
+                self.active[slot] = True
+                self.track_id[slot] = obj_id
+                self._slot_by_id[obj_id] = slot
+            slots[i] = slot
+        return slots
+
+    def _expire(self) -> None:
+        """Libera os slots cujos IDs não aparecem há mais de `grace_frames` atualizações"""
+        expired = np.flatnonzero(self.active & (self.last_seen < self.frame_idx - self.grace_frames))
+        if expired.size == 0:
+            return
+        self.active[expired] = False
+        for slot, obj_id in zip(expired.tolist(), self.track_id[expired].tolist()):
+            del self._slot_by_id[obj_id]
+            self._free_slots.append(slot)
+
+    def update(
+            self,
+            ids: np.ndarray,
+            fractions: np.ndarray,
+            inside: np.ndarray,
+            valid: np.ndarray,
+            threshold: float
+    ) -> np.ndarray:
+        """
+        Atualiza o estado com as detecções do frame e libera os IDs expirados.
+
+        Returns:
+            Índices (no array de detecções) dos objetos que cruzaram a linha.
+        """
+        self.frame_idx += 1
+        selected = np.flatnonzero(valid)
+        if selected.size:
+            slots = self._slots_for(ids[selected])
+            self.last_seen[slots] = self.frame_idx
+            _, self.prev_fraction, self.counted, crossed = _update_crossings(
+                slots,
+                np.ascontiguousarray(fractions[selected], dtype=np.float32),
+                np.ascontiguousarray(inside[selected], dtype=np.bool_),
+                self.prev_fraction,
+                self.counted,
+                np.float32(threshold)
+            )
+            selected = selected[crossed]
+        self._expire()
+        return selected
@@ -0,0 +1,50 @@
+"""
+Agregações numéricas das sessões de contagem (compiladas com Numba quando disponível)
+"""
+from typing import Tuple
+import numpy as np
+
+from .jit import njit
+
+
+@njit("Tuple((float64, float64, int64[:]))(float64[:], float64, float64, int64)",
+      cache=True, fastmath=True)
+def session_stats(timestamps, start, end, n_buckets):
+    """
+    Estatísticas dos instantes de contagem de uma sessão.
+
+    Args:
+        timestamps: Instantes (epoch, segundos) de cada contagem, em ordem.
+        start: Início da sessão (epoch).
+        end: Fim da sessão (epoch).
+        n_buckets: Quantidade de faixas de tempo do histograma.
+
+    Returns:
+        (intervalo médio entre contagens, menor intervalo, contagens por faixa)
+    """
+    histogram = np.zeros(n_buckets, dtype=np.int64)
+    n = timestamps.shape[0]
+    span = end - start
+    if n == 0 or span <= 0.0:
+        return 0.0, 0.0, histogram
+    min_interval = np.inf
+    for i in range(n):
+        bucket = int((timestamps[i] - start) / span * n_buckets)
+        bucket = min(max(bucket, 0), n_buckets - 1)
+        histogram[bucket] += 1
+        if i > 0:
+            min_interval = min(min_interval, timestamps[i] - timestamps[i - 1])
+    if n < 2:
+        return 0.0, 0.0, histogram
+    return (timestamps[n - 1] - timestamps[0]) / (n - 1), min_interval, histogram
+
+
+def compute_session_aggregates(
+        timestamps: np.ndarray,
+        start: float,
+        end: float,
+        n_buckets: int = 24
+) -> Tuple[float, float, np.ndarray]:
+    """Converte as entradas para os tipos esperados e chama session_stats"""
+    return session_stats(np.ascontiguousarray(timestamps, dtype=np.float64),
+                         float(start), float(end), int(n_buckets))
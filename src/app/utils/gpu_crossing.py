@@ -0,0 +1,95 @@
+"""
+Lógica de contagem por cruzamento de linha executada na GPU (backend TensorRT/CUDA)
+
+Mesma regra de utils/crossing.py, mas com as caixas e o estado mantidos em
+tensores CUDA: só os poucos objetos que cruzaram voltam para a CPU.
+"""
+from typing import List, Tuple
+import torch
+
+from .crossing import TRACK_GRACE_FRAMES
+
+GPU_TRACK_SLOTS = 4096  # Tabela indexada por ID % slots (sem mapeamento na CPU)
+_OWNER_PRIORITY = 1 << 40  # Soma ao ID dono do slot na disputa por slot (IDs do ByteTrack são menores)
+
+
+class GpuCrossingState:
+    """
+    Estado de cruzamento por ID do rastreador em tensores CUDA.
+
+    O slot de cada ID é `id % capacity`; o ID dono do slot é guardado junto para
+    que um ID novo que caia num slot antigo comece com o estado zerado. Como em
+    CrossingState, um slot não visto há mais de `grace_frames` atualizações expira:
+    o ID que reaparecer depois disso começa do zero.
+    """
+
+    def __init__(self, device, capacity: int = GPU_TRACK_SLOTS, grace_frames: int = TRACK_GRACE_FRAMES):
+        self.capacity = capacity
+        self.grace_frames = grace_frames
+        self.frame_idx = 0
+        self.prev_fraction = torch.full((capacity,), float("nan"), dtype=torch.float32, device=device)
+        self.counted = torch.zeros(capacity, dtype=torch.bool, device=device)
+        self.track_id = torch.full((capacity,), -1, dtype=torch.int64, device=device)
+        self.last_seen = torch.zeros(capacity, dtype=torch.int64, device=device)
+
+    def skip(self) -> None:
+        """Frame inferido sem detecções: conta para a expiração, como CrossingState.update vazio"""
+        self.frame_idx += 1
+
+    @torch.no_grad()
+    def update(
+            self,
+            xyxy: torch.Tensor,
+            ids: torch.Tensor,
+            line_y: int,
+            x_start: int,
+            x_end: int,
+            threshold: float
+    ) -> List[Tuple[int, float]]:
+        """
+        Atualiza o estado com as caixas do frame (tensores na GPU).
+
+        Returns:
+            Lista de (ID, fração abaixo da linha) dos objetos que cruzaram.
+        """
+        self.frame_idx += 1
+        ids = ids.to(torch.int64)
+        x1, y1, x2, y2 = xyxy.floor().unbind(1)
+        heights = y2 - y1
+        valid = heights > 0
+        fractions = ((y2 - line_y).clamp_min(0) / heights.clamp_min(1)).clamp(0, 1)
+        cx = torch.div(x1 + x2, 2, rounding_mode="floor")
+        inside = (cx >= x_start) & (cx <= x_end)
+
+        slots = ids % self.capacity
+        owner = self.track_id[slots] == ids
+        expired = self.last_seen[slots] < self.frame_idx - self.grace_frames
+        stale = ~owner | expired  # ID novo neste slot (ou slot expirado): estado zerado
+
+        # Dois IDs válidos no mesmo slot neste frame: só um usa o slot (o dono atual, senão o
+        # maior ID), para o resultado não depender da ordem do scatter; os outros são ignorados
+        priority = torch.where(owner, ids + _OWNER_PRIORITY, ids)
+        priority = torch.where(valid, priority, torch.full_like(priority, -1))
+        best = torch.full((self.capacity,), -1, dtype=torch.int64, device=ids.device)
+        best.scatter_reduce_(0, slots, priority, reduce="amax")
+        valid = valid & (priority == best[slots])
+        prev = torch.where(stale, torch.full_like(fractions, float("nan")), self.prev_fraction[slots])
+        counted = self.counted[slots] & ~stale
+
+        below = fractions < threshold
+        crossed = (prev >= threshold) & below & ~counted & inside & valid
+        new_counted = (counted & below) | crossed
+
+        # Caixas inválidas (altura <= 0) não alteram o estado, como na versão CPU; só os
+        # vencedores escrevem, então cada slot recebe no máximo uma escrita
+        sel = valid.nonzero().squeeze(1)
+        sel_slots = slots[sel]
+        self.prev_fraction[sel_slots] = fractions[sel]
+        self.counted[sel_slots] = new_counted[sel]
+        self.track_id[sel_slots] = ids[sel]
+        self.last_seen[sel_slots] = self.frame_idx
+
+        idx = crossed.nonzero().squeeze(1)
+        if idx.numel() == 0:
+            return []
+        return list(zip(ids[idx].tolist(), fractions[idx].tolist()))
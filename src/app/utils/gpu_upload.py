@@ -0,0 +1,71 @@
+"""
+Envio de frames para a GPU a partir de memória pinned (CUDA)
+
+O frame é redimensionado (letterbox) direto num buffer pinned fixo e copiado
+para um tensor fixo na GPU, sem alocar buffers por frame nem passar por memória
+paginável. Não há sobreposição entre cópia e inferência: o upload roda na mesma
+thread, logo antes do model.track(), que só retorna com os resultados na CPU.
+Com um tensor de entrada o Ultralytics ainda copia a imagem de volta para numpy
+(orig_img) a cada frame, por isso o recurso fica desligado por padrão.
+"""
+import cv2
+import numpy as np
+import torch
+
+LETTERBOX_FILL = 114  # Mesma cor de preenchimento do pré-processamento do Ultralytics
+
+
+class CudaFrameUploader:
+    """Converte frames BGR em tensores BCHW float (0-1) já na GPU"""
+
+    def __init__(self, imgsz: int = 640, device: int = 0):
+        self.imgsz = imgsz
+        self.device = torch.device("cuda", device)
+        self._pinned = torch.empty((imgsz, imgsz, 3), dtype=torch.uint8).pin_memory()
+        self._pinned_np = self._pinned.numpy()
+        self._device_u8 = torch.empty((imgsz, imgsz, 3), dtype=torch.uint8, device=self.device)
+        self._copy_done = torch.cuda.Event()
+        self._shape = None
+        self._geometry = (1.0, 0, 0, imgsz, imgsz)
+
+    def _update_geometry(self, height: int, width: int) -> None:
+        """Recalcula escala e margens do letterbox quando a resolução muda"""
+        scale = min(self.imgsz / height, self.imgsz / width)
+        new_w, new_h = int(round(width * scale)), int(round(height * scale))
+        pad_x, pad_y = (self.imgsz - new_w) // 2, (self.imgsz - new_h) // 2
+        self._geometry = (scale, pad_x, pad_y, new_w, new_h)
+        self._shape = (height, width)
+        self._pinned_np.fill(LETTERBOX_FILL)
+
+    def upload(self, frame: np.ndarray) -> torch.Tensor:
+        """Envia o frame para a GPU e retorna o tensor (1, 3, imgsz, imgsz)"""
+        self._copy_done.synchronize()  # O buffer pinned só é reescrito depois da cópia anterior
+        if frame.shape[:2] != self._shape:
+            self._update_geometry(*frame.shape[:2])
+        _, pad_x, pad_y, new_w, new_h = self._geometry
+
+        cv2.resize(frame, (new_w, new_h), dst=self._pinned_np[pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+        self._device_u8.copy_(self._pinned, non_blocking=True)  # Mesmo stream da inferência: ordem garantida
+        self._copy_done.record()
+        # BGR -> RGB, HWC -> CHW, uint8 -> float 0-1
+        return self._device_u8.flip(-1).permute(2, 0, 1).unsqueeze(0).float().div_(255.0)
+
+    def to_frame_coords(self, xyxy: np.ndarray) -> np.ndarray:
+        """Converte caixas do espaço do letterbox para coordenadas do frame original"""
+        scale, pad_x, pad_y, _, _ = self._geometry
+        height, width = self._shape
+        boxes = (xyxy.astype(np.float32) - (pad_x, pad_y, pad_x, pad_y)) / scale
+        np.clip(boxes[:, 0::2], 0, width - 1, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, height - 1, out=boxes[:, 1::2])
+        return boxes
+
+    def to_frame_coords_gpu(self, xyxy: torch.Tensor) -> torch.Tensor:
+        """Mesma conversão de to_frame_coords, sem sair da GPU"""
+        scale, pad_x, pad_y, _, _ = self._geometry
+        height, width = self._shape
+        offset = torch.tensor((pad_x, pad_y, pad_x, pad_y), dtype=xyxy.dtype, device=xyxy.device)
+        boxes = (xyxy - offset) / scale
+        boxes[:, 0::2].clamp_(0, width - 1)
+        boxes[:, 1::2].clamp_(0, height - 1)
+        return boxes
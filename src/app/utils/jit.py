@@ -0,0 +1,17 @@
+"""
+Compilação JIT opcional (Numba) para funções numéricas do loop de detecção
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba é opcional: sem ele as funções rodam em Python puro
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Substituto de numba.njit que devolve a função sem compilar"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
@@ -1,45 +1,189 @@
 """
 Sistema de logging centralizado do LAS Cams System
 """
+import atexit
 import logging
 import logging.handlers
+import multiprocessing
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 import os
 
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+LOG_BACKUP_DAYS = 5
+TRACEBACK_CACHE_SIZE = 128  # Tracebacks formatados guardados (erros repetidos, ex.: reconexão de câmera)
+LOG_BATCH_SIZE = 64  # Registros gravados por lote (um write + um flush por lote)
+LOG_BATCH_INTERVAL = 0.05  # Espera máxima (s) para completar um lote
+
+
+class _CachedTracebackFormatter(logging.Formatter):
+    """
+    Formatter que reaproveita o texto do traceback de exceções repetidas
+    (mesmo tipo, mensagem e pilha), sem percorrer os frames/linhas de novo.
+    """
+
+    def __init__(self, *args, cache_size: int = TRACEBACK_CACHE_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_size = cache_size
+        self._tracebacks: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # Usado pelas threads que logam (QueueHandler.prepare)
+
+    def formatException(self, ei) -> str:
+        exc_type, exc, tb = ei
+        if exc is None or exc.__cause__ is not None or exc.__context__ is not None:
+            return super().formatException(ei)  # Exceções encadeadas: sem cache
+        frames = []
+        while tb is not None:
+            frames.append((tb.tb_frame.f_code.co_filename, tb.tb_lineno))
+            tb = tb.tb_next
+        key = (exc_type, str(exc), tuple(frames))
+        with self._lock:
+            text = self._tracebacks.get(key)
+            if text is not None:
+                self._tracebacks.move_to_end(key)
+                return text
+        text = super().formatException(ei)
+        with self._lock:
+            self._tracebacks[key] = text
+            if len(self._tracebacks) > self._cache_size:
+                self._tracebacks.popitem(last=False)
+        return text
+
+
+LOG_FORMATTER = _CachedTracebackFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt=LOG_DATEFMT)
+QUEUE_FORMATTER = _CachedTracebackFormatter('%(message)s')
+CATEGORY_LOG_FORMATTER = _CachedTracebackFormatter('%(asctime)s - %(levelname)s - %(message)s', datefmt=LOG_DATEFMT)
+
+
+def _daily_file_handler(log_file: Path, backup_count: int = LOG_BACKUP_DAYS) -> logging.Handler:
+    """Arquivo que vira à meia-noite; os anteriores ficam como <arquivo>.AAAAMMDD"""
+    handler = logging.handlers.TimedRotatingFileHandler(
+        log_file, when='midnight', backupCount=backup_count, encoding='utf-8'
+    )
+    handler.suffix = '%Y%m%d'
+    handler.extMatch = re.compile(r'^\d{8}$', re.ASCII)  # Usado para apagar os backups antigos
+    return handler
+
+
+def _write_batch(handler: logging.Handler, records: list) -> None:
+    """
+    Grava um lote no handler. Em handlers de stream, formata tudo, verifica a
+    rotação uma vez e faz um único write do texto juntado seguido de um flush;
+    nos demais (ou com o arquivo fechado), cai no handle() de cada registro.
+    """
+    handler.acquire()
+    try:
+        records = [record for record in records if handler.filter(record)]
+        if not records:
+            return
+        if isinstance(handler, logging.handlers.BaseRotatingHandler):
+            try:
+                if handler.shouldRollover(records[0]):
+                    handler.doRollover()
+            except Exception:
+                handler.handleError(records[0])
+        stream = getattr(handler, 'stream', None) if isinstance(handler, logging.StreamHandler) else None
+        if stream is None:
+            for record in records:
+                handler.handle(record)
+            return
+        lines = []
+        for record in records:
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        try:
+            stream.write(''.join(lines))
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
+    finally:
+        handler.release()
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener que agrupa registros: a partir de cada registro recebido, espera
+    até LOG_BATCH_SIZE registros ou LOG_BATCH_INTERVAL segundos e grava o lote com
+    um write e um flush por handler, em vez de um por registro.
+    Só sobrescreve o handle() público; o laço de leitura da fila é o da stdlib.
+    """
+
+    def handle(self, record) -> None:
+        q = self.queue
+        batch = [self.prepare(record)]
+        deadline = time.monotonic() + LOG_BATCH_INTERVAL
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            q.task_done()  # O laço da stdlib só marca o registro que ele mesmo leu
+            if item is self._sentinel:
+                q.put_nowait(item)  # Devolve: a stdlib encerra depois deste lote
+                break
+            batch.append(self.prepare(item))
+        self.handle_batch(batch)
+
+    def handle_batch(self, records: list) -> None:
+        """Equivalente a handle() para um lote (respeita o nível de cada handler)"""
+        for handler in self.handlers:
+            if self.respect_handler_level:
+                selected = [record for record in records if record.levelno >= handler.level]
+            else:
+                selected = records
+            if selected:
+                _write_batch(handler, selected)
+
+
+def configure_worker_logging() -> None:
+    """
+    Logging de processos filhos: troca os handlers do root (herdados no fork) por um
+    NullHandler. Erros voltam ao processo principal, que os registra. Serve de
+    initializer para ProcessPoolExecutor.
+    """
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.NullHandler())
+
 
 class LoggerManager:
     """Gerenciador de logs do sistema"""
 
-    def __init__(self, logs_dir: str = "logs"):
+    def __init__(self, logs_dir: str = "logs", category_files: bool = False):
         self.logs_dir = Path(logs_dir)
+        self.category_files = category_files  # Arquivos extras por categoria (system, errors, ...)
+        self.verbose_errors = True  # Traceback completo em log_error (config.json: verbose_errors)
+        self._loggers: Dict[str, logging.Logger] = {}
+        if multiprocessing.parent_process() is not None:
+            # Processo filho (ex.: pool de relatórios): sem arquivos próprios, para vários
+            # processos não gravarem/virarem o mesmo las_cams.log
+            self.category_files = False
+            configure_worker_logging()
+            return
         self.logs_dir.mkdir(exist_ok=True)
-        self._loggers: dict = {}
         self._setup_root_logger()
 
     def _setup_root_logger(self) -> None:
         """Configura o logger raiz"""
-        # Formato das mensagens de log
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-        # Handler para arquivo principal
-        main_log_file = self.logs_dir / f"las_cams_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.handlers.RotatingFileHandler(
-            main_log_file,
-            maxBytes=10*1024*1024,  # 10MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        file_handler.setFormatter(formatter)
+        # Handler para arquivo principal (troca de arquivo à meia-noite, sem reiniciar)
+        file_handler = _daily_file_handler(self.logs_dir / "las_cams.log")
+        file_handler.setFormatter(LOG_FORMATTER)
         file_handler.setLevel(logging.INFO)
 
         # Handler para console
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(LOG_FORMATTER)
         console_handler.setLevel(logging.INFO) # Mostra INFO ou superior no console
 
         # Configuração do logger raiz
@@ -49,61 +193,52 @@ class LoggerManager:
         root_logger.setLevel(logging.DEBUG)
 
         # Evita adicionar handlers duplicados se a função for chamada novamente
-        if not root_logger.hasHandlers():
-            root_logger.addHandler(file_handler)
-            root_logger.addHandler(console_handler)
-        else:
-             # Garante que os handlers existentes estejam configurados
-             # (útil em alguns cenários de recarregamento)
-            for handler in root_logger.handlers:
-                 handler.setFormatter(formatter)
-                 if isinstance(handler, logging.StreamHandler):
-                     handler.setLevel(logging.INFO)
-                 elif isinstance(handler, logging.handlers.RotatingFileHandler):
-                     handler.setLevel(logging.INFO)
+        if any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers):
+            file_handler.close()
+            return
+
+        # Quem loga só enfileira; a escrita em disco/console fica numa thread à parte
+        self._log_queue: queue.Queue = queue.Queue(-1)
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+        # O QueueHandler formata a exceção na thread que loga; usa o formatter com cache de traceback
+        queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        queue_handler.setFormatter(QUEUE_FORMATTER)
+        root_logger.addHandler(queue_handler)
+        self._listener = _BatchingQueueListener(
+            self._log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self) -> None:
+        """Esvazia a fila de logs e para a thread de escrita"""
+        listener = getattr(self, '_listener', None)
+        if listener is not None:
+            self._listener = None
+            listener.stop()
 
 
     def get_logger(self, name: str) -> logging.Logger:
-        """Retorna um logger específico"""
-        if name not in self._loggers:
+        """Retorna um logger específico (criado e configurado uma única vez por nome)"""
+        logger = self._loggers.get(name)
+        if logger is None:
             logger = logging.getLogger(name)
             # Define o nível do logger específico (pode ser diferente do root)
             logger.setLevel(logging.DEBUG)
-
-            # --- Handler específico para arquivo deste logger ---
-            log_file = self.logs_dir / f"{name.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.log"
-            handler = logging.handlers.RotatingFileHandler(
-                log_file,
-                maxBytes=5*1024*1024,  # 5MB por arquivo específico
-                backupCount=3,
-                encoding='utf-8'
-            )
-
-            formatter = logging.Formatter(
-                '%(asctime)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            handler.setFormatter(formatter)
-            handler.setLevel(logging.DEBUG) # Grava DEBUG ou superior no arquivo específico
-
-            # Adiciona handler apenas se ainda não tiver um similar
-            # (previne duplicação se get_logger for chamado múltiplas vezes)
-            has_similar_handler = any(
-                isinstance(h, logging.handlers.RotatingFileHandler) and h.baseFilename == str(log_file.resolve())
-                for h in logger.handlers
-            )
-            if not has_similar_handler:
-                logger.addHandler(handler)
-
-            # --- Controle de propagação para o root logger ---
-            # Define como False para evitar que logs deste logger
-            # apareçam DUAS VEZES (uma pelo seu handler, outra pelo root)
-            # no arquivo principal e no console.
-            logger.propagate = True # Mudado para True - Deixa o root logger controlar console/arquivo principal
-
+            # Console/arquivo principal ficam a cargo do root logger
+            logger.propagate = True
+            if self.category_files:
+                logger.addHandler(self._create_category_handler(name))
             self._loggers[name] = logger
+        return logger
 
-        return self._loggers[name]
+    def _create_category_handler(self, name: str) -> logging.Handler:
+        """Handler de arquivo separado por categoria (opcional; o root já grava tudo)"""
+        handler = _daily_file_handler(self.logs_dir / f"{name.lower().replace(' ', '_')}.log", backup_count=3)
+        handler.setFormatter(CATEGORY_LOG_FORMATTER)
+        handler.setLevel(logging.DEBUG) # Grava DEBUG ou superior no arquivo específico
+        return handler
 
     def log_detection_event(self, camera_id: int, event_type: str, details: str) -> None:
         """Log específico para eventos de detecção"""
@@ -123,8 +258,9 @@ class LoggerManager:
     def log_error(self, component: str, error: Exception, details: str = "") -> None:
         """Log específico para erros"""
         logger = self.get_logger("errors")
-        # Usa exc_info=True para incluir o traceback completo no log de erro
-        logger.error(f"{component} - {type(error).__name__}: {str(error)} - {details}", exc_info=True)
+        # Traceback da própria exceção recebida, só com verbose_errors (e nada quando error é None)
+        exc_info = error if self.verbose_errors and isinstance(error, BaseException) else None
+        logger.error(f"{component} - {type(error).__name__}: {str(error)} - {details}", exc_info=exc_info)
 
     # --- FUNÇÃO ADICIONADA ---
     def log_warning(self, component: str, details: str = "") -> None:
@@ -164,6 +300,11 @@ def log_error(component: str, error: Exception, details: str = "") -> None:
     logger_manager.log_error(component, error, details)
 
 
+def set_verbose_errors(enabled: bool) -> None:
+    """Liga/desliga o traceback completo nos logs de erro"""
+    logger_manager.verbose_errors = bool(enabled)
+
+
 # --- FUNÇÃO ADICIONADA ---
 def log_warning(component: str, details: str = "") -> None:
     """Log de aviso"""
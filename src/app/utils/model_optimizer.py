@@ -2,14 +2,22 @@
 Otimizador de modelos YOLO para aceleração de hardware
 Exporta modelos para TensorRT (NVIDIA) e OpenVINO (Intel)
 """
+import argparse
+import cv2
 import torch
 from pathlib import Path
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 from ultralytics import YOLO
 
 from ..config.settings import config_manager
 from ..utils.logger import log_system_event, log_error
 
+# NMS embutido no engine TensorRT: conf baixo e fixo, o limiar configurado é aplicado em
+# track(conf=...) a cada frame (mudar confidence_threshold não exige reexportar)
+ENGINE_NMS_CONF = 0.01
+ENGINE_NMS_IOU = 0.45
+
 
 def check_and_export_models() -> dict:
     """
@@ -41,12 +49,15 @@ def check_and_export_models() -> dict:
         print("ℹ️ [ModelOptimizer] Auto-otimização desabilitada no config.json")
         return results
 
+    # Modelo base carregado uma única vez, e só se alguma exportação for necessária
+    load_base_model = lru_cache(maxsize=1)(lambda: YOLO(str(model_path)))
+
     # 1. Verifica e exporta TensorRT (NVIDIA CUDA)
-    if _check_and_export_tensorrt(cfg, model_path):
+    if _check_and_export_tensorrt(cfg, load_base_model):
         results['tensorrt'] = True
 
     # 2. Verifica e exporta OpenVINO (Intel)
-    if _check_and_export_openvino(cfg, model_path):
+    if _openvino_needed(cfg, results['tensorrt']) and _check_and_export_openvino(cfg, load_base_model):
         results['openvino'] = True
 
     # 3. Verifica DirectML (AMD/Outras GPUs no Windows)
@@ -56,9 +67,35 @@ def check_and_export_models() -> dict:
     return results
 
 
-def _check_and_export_tensorrt(cfg, model_path: Path) -> bool:
+def get_tensorrt_precision(cfg) -> str:
+    """Precisão configurada para o engine TensorRT: 'int8', 'fp16' ou 'fp32'"""
+    if getattr(cfg, 'trt_int8', False):
+        return 'int8'
+    return 'fp16' if getattr(cfg, 'trt_half', True) else 'fp32'
+
+
+def _tensorrt_precision_path(cfg) -> Path:
+    """
+    Caminho do engine com a precisão e o max_det embutido no nome (ex.: best_fp16_md300.engine):
+    mudar qualquer um dos dois gera um novo export em vez de reutilizar o engine antigo
+    """
+    base = Path(cfg.model_path_tensorrt)
+    return base.with_name(f"{base.stem}_{get_tensorrt_precision(cfg)}_md{cfg.engine_max_det}{base.suffix}")
+
+
+def get_tensorrt_engine_path(cfg) -> str:
+    """
+    Engine TensorRT a carregar: o da precisão configurada, se já exportado;
+    senão o caminho configurado (engines antigos / escolhidos manualmente).
+    """
+    precision_path = _tensorrt_precision_path(cfg)
+    return str(precision_path) if precision_path.exists() else cfg.model_path_tensorrt
+
+
+def _check_and_export_tensorrt(cfg, load_base_model: Callable[[], YOLO]) -> bool:
     """Verifica GPU NVIDIA e exporta modelo para TensorRT"""
-    tensorrt_path = Path(cfg.model_path_tensorrt)
+    tensorrt_path = _tensorrt_precision_path(cfg)
+    precision = get_tensorrt_precision(cfg)
 
     # Verifica se CUDA está disponível
     if not torch.cuda.is_available():
@@ -72,16 +109,32 @@ def _check_and_export_tensorrt(cfg, model_path: Path) -> bool:
 
     # Exporta modelo para TensorRT
     try:
-        print("🚀 [TensorRT] GPU NVIDIA detectada! Exportando modelo...")
+        print(f"🚀 [TensorRT] GPU NVIDIA detectada! Exportando modelo ({precision.upper()})...")
         print("   ⚠️ Isso pode levar alguns minutos na primeira execução...")
 
-        model = YOLO(str(model_path))
-        model.export(format='engine', device=0)  # TensorRT export
+        export_args = {'half': precision == 'fp16'}
+        if precision == 'int8':
+            calib_yaml = Path(cfg.calibration_yaml)
+            if not calib_yaml.exists():
+                print(f"❌ [TensorRT] INT8 requer dataset de calibração: {calib_yaml}")
+                print("   Gere com: python -m app.utils.model_optimizer --int8")
+                return False
+            export_args.update(int8=True, data=str(calib_yaml))
+
+        model = load_base_model()
+        # NMS embutido no engine: roda na GPU e devolve no máximo max_det caixas já filtradas
+        exported = model.export(format='engine', device=0, imgsz=cfg.imgsz, dynamic=False, simplify=True,
+                                workspace=4, nms=True, iou=ENGINE_NMS_IOU, conf=ENGINE_NMS_CONF,
+                                max_det=cfg.engine_max_det, **export_args)
+
+        # O Ultralytics grava <modelo>.engine; renomeia com a precisão para não reutilizar engines antigos
+        if exported and Path(exported).exists():
+            Path(exported).replace(tensorrt_path)
 
         # Verifica se a exportação foi bem-sucedida
         if tensorrt_path.exists():
             print(f"✅ [TensorRT] Modelo exportado com sucesso: {tensorrt_path}")
-            log_system_event("TENSORRT_MODEL_EXPORTED")
+            log_system_event(f"TENSORRT_MODEL_EXPORTED_{precision.upper()}")
             return True
         else:
             print("⚠️ [TensorRT] Exportação concluída mas arquivo não encontrado")
@@ -94,7 +147,21 @@ def _check_and_export_tensorrt(cfg, model_path: Path) -> bool:
         return False
 
 
-def _check_and_export_openvino(cfg, model_path: Path) -> bool:
+def _openvino_needed(cfg, tensorrt_ready: bool) -> bool:
+    """
+    Indica se vale exportar o OpenVINO: com o engine TensorRT pronto e o backend
+    automático/TensorRT, o modelo OpenVINO nunca seria carregado.
+    """
+    if not getattr(cfg, 'openvino_enabled', True):
+        print("ℹ️ [OpenVINO] Exportação desabilitada no config.json")
+        return False
+    if tensorrt_ready and cfg.preferred_backend in ("auto", "tensorrt"):
+        print("ℹ️ [OpenVINO] TensorRT disponível; exportação OpenVINO dispensada")
+        return False
+    return True
+
+
+def _check_and_export_openvino(cfg, load_base_model: Callable[[], YOLO]) -> bool:
     """Verifica CPU Intel e exporta modelo para OpenVINO"""
     openvino_path = Path(cfg.model_path_openvino)
 
@@ -109,7 +176,7 @@ def _check_and_export_openvino(cfg, model_path: Path) -> bool:
         print("🚀 [OpenVINO] Exportando modelo para otimização de CPU/Intel...")
         print("   ⚠️ Isso pode levar alguns minutos na primeira execução...")
 
-        model = YOLO(str(model_path))
+        model = load_base_model()
         model.export(format='openvino')
 
         # Verifica se a exportação foi bem-sucedida
@@ -128,6 +195,92 @@ def _check_and_export_openvino(cfg, model_path: Path) -> bool:
         return False
 
 
+def dump_calibration_frames(output_dir: str = "calib", frames_per_camera: int = 500, frame_step: int = 5) -> int:
+    """
+    Salva frames representativos de cada câmera habilitada para calibrar a quantização INT8.
+
+    Args:
+        output_dir: Pasta de saída (as imagens ficam em `output_dir/images`).
+        frames_per_camera: Quantidade de frames salvos por câmera.
+        frame_step: Salva um frame a cada `frame_step` lidos (mais variedade).
+
+    Returns:
+        int: Total de frames salvos
+    """
+    images_dir = Path(output_dir) / "images"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for cam_id, camera in config_manager.config.cameras.items():
+        if not camera.enabled or not camera.source:
+            continue
+        source = int(camera.source) if camera.source.isdigit() else camera.source
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            print(f"⚠️ [INT8] Câmera {cam_id} indisponível: '{camera.source}'")
+            continue
+        saved = read = 0
+        try:
+            while saved < frames_per_camera:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                read += 1
+                if read % frame_step:
+                    continue
+                cv2.imwrite(str(images_dir / f"cam{cam_id}_{saved:05d}.jpg"), frame)
+                saved += 1
+        finally:
+            cap.release()
+        print(f"✅ [INT8] Câmera {cam_id}: {saved} frames salvos")
+        total += saved
+    return total
+
+
+def export_openvino_int8(cfg, model_path: Path, calib_dir: str = "calib") -> bool:
+    """
+    Exporta o modelo para OpenVINO INT8 (quantização pós-treino via NNCF).
+
+    Usa as imagens de `calib_dir/images` (geradas por dump_calibration_frames)
+    como dataset de calibração; não são necessários rótulos.
+    """
+    int8_path = Path(cfg.model_path_openvino_int8)
+    if int8_path.exists() and int8_path.is_dir():
+        print(f"✅ [OpenVINO INT8] Modelo quantizado já existe: {int8_path}")
+        return True
+
+    images_dir = Path(calib_dir) / "images"
+    if not images_dir.exists() or not any(images_dir.glob("*.jpg")):
+        print(f"❌ [OpenVINO INT8] Nenhum frame de calibração em: {images_dir}")
+        return False
+
+    try:
+        print("🚀 [OpenVINO INT8] Quantizando modelo (calibração)...")
+        print("   ⚠️ Isso pode levar vários minutos...")
+
+        model = YOLO(str(model_path))
+        data_yaml = Path(calib_dir) / "calib.yaml"
+        names = "\n".join(f"  {idx}: {name}" for idx, name in model.names.items())
+        data_yaml.write_text(
+            f"path: {Path(calib_dir).resolve().as_posix()}\ntrain: images\nval: images\nnames:\n{names}\n",
+            encoding="utf-8"
+        )
+        model.export(format='openvino', int8=True, data=str(data_yaml), imgsz=cfg.imgsz)
+
+        if int8_path.exists():
+            print(f"✅ [OpenVINO INT8] Modelo exportado com sucesso: {int8_path}")
+            log_system_event("OPENVINO_INT8_MODEL_EXPORTED")
+            return True
+        else:
+            print("⚠️ [OpenVINO INT8] Exportação concluída mas pasta não encontrada")
+            return False
+
+    except Exception as e:
+        log_error("ModelOptimizer", e, "Erro ao exportar para OpenVINO INT8")
+        print(f"❌ [OpenVINO INT8] Falha na exportação: {str(e)}")
+        return False
+
+
+@lru_cache(maxsize=1)
 def _check_directml() -> bool:
     """Verifica se DirectML está disponível (AMD/Outras GPUs no Windows)"""
     try:
@@ -153,6 +306,12 @@ def get_hardware_info() -> dict:
     Returns:
         dict: Informações detalhadas do hardware
     """
+    return dict(_probe_hardware())  # Cópia: quem chama pode alterar sem afetar o cache
+
+
+@lru_cache(maxsize=1)
+def _probe_hardware() -> dict:
+    """Consulta driver CUDA / DirectML uma única vez por processo"""
     info = {
         'cuda_available': False,
         'cuda_devices': 0,
@@ -220,6 +379,20 @@ def print_optimization_summary(results: dict) -> None:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica hardware e exporta modelos otimizados")
+    parser.add_argument("--int8", action="store_true",
+                        help="Coleta frames das câmeras e exporta o modelo OpenVINO INT8")
+    parser.add_argument("--calib-dir", default="calib", help="Pasta dos frames de calibração")
+    parser.add_argument("--frames", type=int, default=500, help="Frames de calibração por câmera")
+    args = parser.parse_args()
+
+    if args.int8:
+        cfg = config_manager.config.detection
+        if dump_calibration_frames(args.calib_dir, args.frames) == 0:
+            print("⚠️ [INT8] Nenhum frame novo coletado; usando os existentes em", args.calib_dir)
+        export_openvino_int8(cfg, Path(cfg.model_path), args.calib_dir)
+        raise SystemExit(0)
+
     # Teste standalone
     print("🔍 Verificando hardware e modelos...\n")
 
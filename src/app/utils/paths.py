@@ -0,0 +1,32 @@
+"""
+Caminhos de dados do usuário (caches e arquivos gerados fora do projeto)
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+
+USER_DATA_DIR_NAME = ".las_cam2"
+
+
+@lru_cache(maxsize=1)
+def _user_data_dir() -> Path:
+    """Pasta ~/.las_cam2, criada na primeira chamada (uma syscall por processo)"""
+    base = Path.home() / USER_DATA_DIR_NAME
+    try:
+        os.mkdir(base)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        base.mkdir(parents=True, exist_ok=True)  # Home inexistente (ex.: contêiner)
+    return base
+
+
+@lru_cache(maxsize=None)
+def get_user_data_path(*parts: str) -> Path:
+    """
+    Retorna um caminho dentro de ~/.las_cam2, criando a pasta se necessário.
+
+    Args:
+        parts: Componentes adicionais do caminho (ex.: "backend.json").
+    """
+    return _user_data_dir().joinpath(*parts)
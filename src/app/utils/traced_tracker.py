@@ -0,0 +1,66 @@
+"""
+Caminho de inferência especializado para modelos PyTorch (.pt)
+
+Traça o forward do modelo uma vez para o tamanho de entrada fixo e, a cada
+frame, executa apenas: letterbox -> forward traçado -> NMS -> ByteTrack.
+Evita o despacho genérico do `model.track()` (merge de argumentos, dataloader,
+callbacks) nos backends em que não há TensorRT.
+"""
+from typing import Tuple
+import numpy as np
+import torch
+
+from ultralytics.data.augment import LetterBox
+from ultralytics.engine.results import Boxes
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load, ops
+from ultralytics.utils.checks import check_yaml
+
+
+class TracedTracker:
+    """Detector traçado com torch.jit + ByteTrack independente"""
+
+    def __init__(
+            self,
+            torch_model: torch.nn.Module,
+            device,
+            imgsz: int = 640,
+            conf: float = 0.5,
+            iou: float = 0.7,
+            tracker_cfg: str = "bytetrack.yaml",
+            frame_rate: int = 30
+    ):
+        self.device = device
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self._letterbox = LetterBox(new_shape=(imgsz, imgsz), auto=False)
+        model = torch_model.to(device).eval()
+        dummy = torch.zeros(1, 3, imgsz, imgsz, device=device)
+        with torch.no_grad():
+            self._traced = torch.jit.trace(model, dummy, strict=False)
+            self._traced(dummy)  # Aquece o grafo traçado
+        tracker_args = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_cfg)))
+        self._tracker = BYTETracker(args=tracker_args, frame_rate=frame_rate)
+
+    def track(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detecta e rastreia os objetos do frame.
+
+        Returns:
+            (caixas xyxy int32 em coordenadas do frame, IDs int64, confianças float32)
+        """
+        image = self._letterbox(image=frame)
+        tensor = torch.from_numpy(np.ascontiguousarray(image[..., ::-1].transpose(2, 0, 1)))
+        tensor = tensor.to(self.device).float().div_(255.0).unsqueeze(0)
+        with torch.no_grad():
+            preds = self._traced(tensor)
+        if isinstance(preds, (list, tuple)):
+            preds = preds[0]
+        det = ops.non_max_suppression(preds, self.conf, self.iou)[0]
+        det[:, :4] = ops.scale_boxes(tensor.shape[2:], det[:, :4], frame.shape[:2])
+
+        tracks = self._tracker.update(Boxes(det.cpu().numpy(), frame.shape[:2]), frame)
+        if len(tracks) == 0:
+            return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return tracks[:, :4].astype(np.int32), tracks[:, 4].astype(np.int64), tracks[:, 5].astype(np.float32)
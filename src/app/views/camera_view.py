@@ -3,23 +3,62 @@ Tela de câmera individual refatorada
 """
 import customtkinter as ctk
 from typing import Callable, Optional
+import queue
+import threading
 import cv2
-from PIL import Image, ImageTk
-from tkinter import messagebox
+import numpy as np
+import tkinter as tk
 
 from ..models.entities import CargoType
+from ..utils.logger import get_logger
 from .components import (
-    ModernButton, ModernLabel, show_notification, show_error_dialog
+    ModernButton, ModernLabel, show_notification, show_error_dialog, show_message
 )
 
+_log = get_logger("CameraView")
+
+_CARGO_DISPLAY_NAMES = tuple(CargoType.get_display_names())  # Fixo: calculado uma vez por processo
+FRAME_RENDER_DELAY_MS = 16  # Intervalo entre leituras do frame pronto pela thread do Tk (~60 Hz)
+# Prévia ao vivo: bilinear em qualquer escala (INTER_AREA chega a ~7x mais caro em escalas não inteiras)
+PREVIEW_INTERPOLATION = cv2.INTER_LINEAR
+# Opções de cada widget para detecção ativa/inativa: (botão, label de status, demais estados)
+_DETECTION_STATUS_UI = {
+    True: (
+        {"text": "Parar Detecção", "state": "normal", "fg_color": "#C24E4E", "hover_color": "#E57373"},  # Vermelho (perigo)
+        {"text": "Status: Ativo", "text_color": "#3BA776"},  # Verde
+        {"reset": "normal", "cargo": "disabled"},
+    ),
+    False: (
+        {"text": "Iniciar Detecção", "state": "normal", "fg_color": "#3BA776", "hover_color": "#4FC48C"},  # Verde (sucesso)
+        {"text": "Status: Inativo", "text_color": "#E8A23B"},  # Laranja/Amarelo
+        {"reset": "disabled", "cargo": "normal"},
+    ),
+}
+_CONNECTING_STATUS_UI = {"text": "Status: Conectando...", "text_color": "orange"}  # Entre pedir e confirmar o início
+_STOP_WORKER = object()  # Sentinela para encerrar a thread de conversão
+
+
+def _put_latest(q: queue.Queue, item) -> None:
+    """Coloca o item numa fila de tamanho 1, descartando o que ainda não foi consumido"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
 
 class CameraView(ctk.CTkToplevel):
     """Tela de câmera individual"""
 
     def __init__(self, master, camera_id: int, camera_name: str,
-                 on_start_detection: Callable[[int, CargoType], None],
-                 on_stop_detection: Callable[[int], None],
-                 on_generate_report: Callable[[int], None]):
+                 on_start_detection: Callable[[int, CargoType], bool],
+                 on_stop_detection: Callable[[int], bool],
+                 on_generate_report: Callable[[int], None],
+                 on_close: Optional[Callable[[int], None]] = None):
         super().__init__(master)
 
         self.camera_id = camera_id
@@ -27,9 +66,21 @@ class CameraView(ctk.CTkToplevel):
         self.on_start_detection = on_start_detection
         self.on_stop_detection = on_stop_detection
         self.on_generate_report = on_generate_report
+        self.on_close = on_close  # Sem callback, fechar destrói a janela
 
         self.is_detection_active = False
         self.current_count = 0
+        self._applied_status: Optional[bool] = None  # Último status aplicado aos widgets
+        self._manual_report_state: Optional[str] = None
+        self._photo: Optional[tk.PhotoImage] = None  # Imagem Tk reaproveitada entre frames
+        # Pipeline de vídeo: frame BGR -> worker (resize/RGB/PPM) -> thread do Tk (só PhotoImage)
+        self._frame_in: queue.Queue = queue.Queue(maxsize=1)
+        self._frame_out: queue.Queue = queue.Queue(maxsize=1)
+        self._waiting_frame = None  # Frame aguardando o primeiro <Configure> do label
+        self._render_busy = False  # Há um frame entregue ainda não exibido (ver wants_frame)
+        self._closed = False
+        self._hidden = False  # Escondida (withdraw) aguardando reuso, ver hide()/reset_for()
+        self._drain_scheduled = False  # Há um _drain_frames agendado (parado enquanto escondida)
 
         self._create_ui()
         self._center_window()
@@ -66,16 +117,12 @@ class CameraView(ctk.CTkToplevel):
         )
         self.name_label.pack(side="left")
 
-        # Frame de vídeo
-        self.video_frame = ctk.CTkFrame(self, fg_color="#2B2B2B", corner_radius=10)
-        self.video_frame.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
-
-        self.video_label = ModernLabel(
-            self.video_frame,
-            text="Aguardando conexão...",
-            style="body"
-        )
-        self.video_label.pack(expand=True, fill="both", padx=10, pady=10)
+        # Painel de vídeo: criado só quando a detecção inicia ou chega o primeiro frame
+        self.video_frame = None
+        self.video_label = None
+        self._video_panel_requested = False
+        self._label_w = self._label_h = 0  # Tamanho do label, atualizado só quando ele muda
+        self._resize_plan = None  # (tamanho do frame, tamanho de destino, interpolação, cabeçalho PPM)
 
         # Controles (Contagem, Status, Tipo de Carga)
         self.controls_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -113,7 +160,7 @@ class CameraView(ctk.CTkToplevel):
 
         self.cargo_type_combo = ctk.CTkComboBox(
             self.controls_frame,
-            values=CargoType.get_display_names(),
+            values=list(_CARGO_DISPLAY_NAMES),
             width=200,
             height=35,
             font=("", 14)
@@ -174,7 +221,7 @@ class CameraView(ctk.CTkToplevel):
         """Alterna detecção, validando o tipo de carga ao iniciar"""
         if self.is_detection_active:
             # Para a detecção
-            self.on_stop_detection(self.camera_id)
+            self._request_detection_change(self.on_stop_detection, self.camera_id)
         else:
             # Valida tipo de carga antes de iniciar
             selected_cargo_str = self.cargo_type_combo.get()
@@ -202,7 +249,19 @@ class CameraView(ctk.CTkToplevel):
                 return
 
             # Inicia detecção com tipo válido
-            self.on_start_detection(self.camera_id, selected_cargo_type)
+            self._request_detection_change(self.on_start_detection, self.camera_id, selected_cargo_type)
+
+    def _request_detection_change(self, request: Callable[..., bool], *args):
+        """
+        Desabilita o botão de detecção enquanto o pedido está em andamento. A
+        confirmação (update_detection_status) o reabilita; se o pedido falhar na
+        hora, o status atual é reaplicado.
+        """
+        self.detection_button.configure(state="disabled")
+        if request(*args) or self._closed:  # Falha pode ter fechado a janela
+            return
+        self._applied_status = None
+        self.update_detection_status(self.is_detection_active)
 
     def _handle_generate_report(self):
         """Gera relatório manualmente"""
@@ -225,105 +284,249 @@ class CameraView(ctk.CTkToplevel):
     def update_detection_status(self, is_active: bool):
         """
         Atualiza status da detecção e estado dos botões/widgets.
-        CORRIGIDO: Remove 'style=' e usa 'fg_color=' e 'hover_color='
+        Um configure por widget (opções de _DETECTION_STATUS_UI); se o status não
+        mudou, só o botão de relatório manual (que depende da contagem) é revisto.
         """
         self.is_detection_active = is_active
-
         if is_active:
-            # Detecção ATIVA - Botão vermelho (Parar)
-            self.detection_button.configure(
-                text="Parar Detecção",
-                state="normal",
-                fg_color="#C24E4E",  # Vermelho (perigo)
-                hover_color="#E57373"
-            )
-            self.status_label.configure(
-                text="Status: Ativo",
-                text_color="#3BA776"  # Verde
-            )
-            self.reset_button.configure(state="normal")
-            self.manual_report_button.configure(state="disabled")
-            self.cargo_type_combo.configure(state="disabled")
-        else:
-            # Detecção INATIVA - Botão verde (Iniciar)
-            self.detection_button.configure(
-                text="Iniciar Detecção",
-                state="normal",
-                fg_color="#3BA776",  # Verde (sucesso)
-                hover_color="#4FC48C"
-            )
-            self.status_label.configure(
-                text="Status: Inativo",
-                text_color="#E8A23B"  # Laranja/Amarelo
-            )
-            self.reset_button.configure(state="disabled")
-
-            # Habilita relatório manual só se houver contagem
-            manual_report_state = "normal" if self.current_count > 0 else "disabled"
+            self._create_video_panel()
+
+        if is_active != self._applied_status:
+            self._applied_status = is_active
+            button_opts, status_opts, widgets_state = _DETECTION_STATUS_UI[is_active]
+            self.detection_button.configure(**button_opts)
+            self.status_label.configure(**status_opts)
+            self.reset_button.configure(state=widgets_state["reset"])
+            self.cargo_type_combo.configure(state=widgets_state["cargo"])
+
+        # Relatório manual só com a detecção parada e se houver contagem
+        manual_report_state = "normal" if not is_active and self.current_count > 0 else "disabled"
+        if manual_report_state != self._manual_report_state:
+            self._manual_report_state = manual_report_state
             self.manual_report_button.configure(state=manual_report_state)
 
-            self.cargo_type_combo.configure(state="normal")
+    def show_connecting_status(self):
+        """Estado intermediário até a detecção confirmar o início (ou falhar)"""
+        self.status_label.configure(**_CONNECTING_STATUS_UI)
+        self._applied_status = None  # Força o próximo update_detection_status a reaplicar o status
 
     def update_count(self, count: int):
-        """Atualiza contagem"""
+        """Atualiza contagem (chamado a cada frame; só reconfigura o label quando o valor muda)"""
+        if count == self.current_count:
+            return
         self.current_count = count
         self.count_label.configure(text=f"Contagem: {count}")
 
     def update_video_frame(self, frame):
-        """Atualiza frame de vídeo"""
-        try:
-            # Valida frame
-            if frame is None or frame.size == 0:
-                self.video_label.configure(image=None, text="Frame inválido")
-                self.video_label.image = None
-                return
-
-            # Converte BGR (OpenCV) para RGB (PIL)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
+        """
+        Recebe um novo frame de vídeo (de qualquer thread). Só o mais recente é
+        processado: um frame ainda não pego pelo worker é substituído.
+        """
+        if self._closed or self._hidden:
+            return
+        if self.video_label is None and not self._video_panel_requested:
+            self._video_panel_requested = True
+            self.after(0, self._create_video_panel)  # Widgets só na thread do Tk
+        self._render_busy = True
+        _put_latest(self._frame_in, frame)
+
+    def wants_frame(self) -> bool:
+        """
+        Contrato com o produtor: False enquanto o último frame entregue ainda não foi
+        exibido. Consultado antes de anotar o frame, evita desenhar e converter
+        frames que seriam descartados pela fila de tamanho 1.
+        """
+        return not (self._closed or self._hidden or self._render_busy)
 
-            # Remove texto se existir
-            if self.video_label.cget("text"):
-                self.video_label.configure(text="")
+    def _create_video_panel(self):
+        """Cria o painel de vídeo e inicia a conversão/exibição de frames (uma única vez)"""
+        if self.video_label is not None or not self.winfo_exists():
+            return
+        self.video_frame = ctk.CTkFrame(self, fg_color="#2B2B2B", corner_radius=10)
+        self.video_frame.grid(row=1, column=0, padx=20, pady=5, sticky="nsew")
 
-            # Obtém dimensões do label
-            label_width = self.video_label.winfo_width()
-            label_height = self.video_label.winfo_height()
+        self.video_label = ModernLabel(
+            self.video_frame,
+            text="Aguardando conexão...",
+            style="body"
+        )
+        self.video_label.pack(expand=True, fill="both", padx=10, pady=10)
+        self.video_label.bind("<Configure>", self._on_video_label_configure)
+
+        threading.Thread(target=self._frame_worker, daemon=True,
+                         name=f"CameraView-{self.camera_id}-frames").start()
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        """Agenda o próximo _drain_frames (um só agendamento por vez)"""
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.after(FRAME_RENDER_DELAY_MS, self._drain_frames)
+
+    def _on_video_label_configure(self, event):
+        """Guarda o novo tamanho do label de vídeo"""
+        self._label_w, self._label_h = event.width, event.height
+        self._resize_plan = None  # Recalculado no próximo frame
+        if self._waiting_frame is not None and event.width > 1 and event.height > 1:
+            frame, self._waiting_frame = self._waiting_frame, None
+            _put_latest(self._frame_in, frame)
+
+    def _make_resize_plan(self, frame_hw):
+        """
+        Calcula (e guarda) tamanho de destino, interpolação e cabeçalho PPM para
+        frames de tamanho `frame_hw`. Retorna None se o label ainda não tem tamanho.
+        Roda no worker: usa só o tamanho guardado pelo <Configure>, sem chamadas ao Tk.
+        """
+        label_width, label_height = self._label_w, self._label_h
+        if label_width <= 1 or label_height <= 1:
+            return None
+
+        # Mantém o aspect ratio do frame
+        img_height, img_width = frame_hw
+        ratio = min(label_width / img_width, label_height / img_height)
+        new_width = max(1, int(img_width * ratio))
+        new_height = max(1, int(img_height * ratio))
+        if (new_width, new_height) == (img_width, img_height):
+            interpolation = None  # Sem redimensionamento
+        else:
+            interpolation = PREVIEW_INTERPOLATION
+        header = b"P6\n%d %d\n255\n" % (new_width, new_height)
+        self._resize_plan = (tuple(frame_hw), (new_width, new_height), interpolation, header)
+        return self._resize_plan
 
-            # Se o label ainda não foi renderizado, agenda nova tentativa
-            if label_width <= 1 or label_height <= 1:
-                self.after(50, lambda: self.update_video_frame(frame))
+    def _frame_worker(self):
+        """
+        Thread de conversão: redimensiona, converte para RGB e monta o PPM fora da
+        thread do Tk (o OpenCV libera o GIL). O resultado vai para `_frame_out`.
+        """
+        # Buffers de trabalho reaproveitados entre frames; só mudam com (forma do frame, tamanho de destino)
+        buffers_key = None
+        resized_buf = rgb_buf = None
+        while True:
+            frame = self._frame_in.get()
+            if frame is _STOP_WORKER or self._closed:
                 return
+            try:
+                if frame is None or frame.size == 0:
+                    _put_latest(self._frame_out, "Frame inválido")
+                    continue
+
+                plan = self._resize_plan
+                if plan is None or plan[0] != frame.shape[:2]:
+                    plan = self._make_resize_plan(frame.shape[:2])
+                    # Label ainda sem tamanho: guarda só o frame mais recente até o <Configure>.
+                    # Libera o produtor: se o <Configure> já passou, o próximo frame encontra o tamanho
+                    if plan is None:
+                        self._waiting_frame = frame
+                        self._render_busy = False
+                        continue
+                _, new_size, interpolation, header = plan
+
+                if buffers_key != (frame.shape, new_size):
+                    buffers_key = (frame.shape, new_size)
+                    dst_shape = (new_size[1], new_size[0]) + frame.shape[2:]
+                    resized_buf = None if interpolation is None else np.empty(dst_shape, dtype=frame.dtype)
+                    rgb_buf = np.empty(dst_shape, dtype=frame.dtype)
+
+                # Redimensiona no OpenCV (SIMD) antes de converter a cor: cvtColor só vê a imagem pequena.
+                # Frame já no tamanho de exibição: usa o próprio (cvtColor escreve em rgb_buf, o original não muda)
+                if interpolation is None:
+                    frame_small = frame
+                else:
+                    frame_small = cv2.resize(frame, new_size, dst=resized_buf, interpolation=interpolation)
+                frame_rgb = cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                # Concatena direto do buffer do array (sem a cópia intermediária de tobytes);
+                # o bytes resultante é uma cópia, então rgb_buf pode ser reescrito no próximo frame.
+                # Precisa ser bytes: o _tkinter converte bytearray/memoryview para texto (repr), não para dados
+                _put_latest(self._frame_out, header + frame_rgb.data)
+            except Exception as e:
+                _put_latest(self._frame_out, f"Erro ao atualizar frame:\n{e}")
+
+    def _drain_frames(self):
+        """Na thread do Tk: exibe o último PPM pronto (ou mensagem de erro) e reagenda"""
+        self._drain_scheduled = False
+        if not self.winfo_exists() or self._hidden:
+            return  # Escondida: reset_for() retoma a leitura
+        # Frame estacionado pelo worker depois do único <Configure>: devolve ao worker
+        if self._waiting_frame is not None and self._label_w > 1 and self._label_h > 1:
+            frame, self._waiting_frame = self._waiting_frame, None
+            _put_latest(self._frame_in, frame)
+        try:
+            item = self._frame_out.get_nowait()
+        except queue.Empty:
+            item = None
+        if isinstance(item, bytes):
+            self._show_ppm(item)
+        elif item is not None:
+            self.video_label.configure(image=None, text=item)
+            self.video_label.image = None
+            _log.warning(f"Câmera {self.camera_id}: {item}")
+        if item is not None:
+            self._render_busy = False  # Libera o próximo frame do produtor
+        self._schedule_drain()
 
-            # Calcula proporção para manter aspect ratio
-            img_width, img_height = frame_pil.size
-
-            if img_width > 0 and img_height > 0:
-                ratio = min(label_width / img_width, label_height / img_height)
+    def _show_ppm(self, ppm: bytes):
+        """Atualiza a imagem do label com um PPM binário (cabeçalho + pixels RGB), sem PIL"""
+        try:
+            if self._photo is None:
+                self._photo = tk.PhotoImage(master=self, data=ppm, format="PPM")
             else:
-                ratio = 1
-
-            new_width = max(1, int(img_width * ratio))
-            new_height = max(1, int(img_height * ratio))
-
-            # Redimensiona imagem
-            frame_pil_resized = frame_pil.resize(
-                (new_width, new_height),
-                Image.Resampling.LANCZOS
-            )
+                self._photo.configure(data=ppm, format="PPM")  # Troca os pixels da mesma imagem Tk
 
-            # Converte para PhotoImage
-            frame_tk = ImageTk.PhotoImage(frame_pil_resized)
-
-            # Atualiza label
-            self.video_label.configure(image=frame_tk)
-            self.video_label.image = frame_tk  # Mantém referência
+            # Associa a imagem ao label (e tira o texto) só quando ainda não está nele
+            if getattr(self.video_label, "image", None) is not self._photo:
+                self.video_label.configure(image=self._photo, text="")
+                self.video_label.image = self._photo  # Mantém referência
 
         except Exception as e:
             error_text = f"Erro ao atualizar frame:\n{e}"
             self.video_label.configure(image=None, text=error_text)
             self.video_label.image = None
-            print(f"[CameraView {self.camera_id}] {error_text}")
+            _log.error(f"Câmera {self.camera_id}: {error_text}")
+
+    def hide(self):
+        """Esconde a janela (withdraw) para ser reaberta com reset_for, sem recriar os widgets"""
+        self._hidden = True
+        self.grab_release()
+        self.withdraw()
+
+    def reset_for(self, camera_name: str):
+        """Reabre uma janela escondida por hide() no estado de uma janela nova"""
+        self.camera_name = camera_name
+        self.title(f"Câmera {self.camera_id} - {camera_name}")
+        self.name_label.configure(text=camera_name)
+
+        self.current_count = 0
+        self.count_label.configure(text="Contagem: 0")
+        self._applied_status = None
+        self.update_detection_status(False)
+        self.cargo_type_combo.set(CargoType.DESCONHECIDO.value)  # Depois de reabilitar o combo
+
+        # Descarta o último frame da abertura anterior
+        self._waiting_frame = None
+        for q in (self._frame_in, self._frame_out):
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+        self._render_busy = False
+        if self.video_label is not None:
+            self.video_label.configure(image=None, text="Aguardando conexão...")
+            self.video_label.image = None
+
+        self._hidden = False
+        if self.video_label is not None:
+            self._schedule_drain()  # Retoma a leitura parada em hide()
+        self.deiconify()
+        self.grab_set()
+        self.lift()
+        self.focus_force()
+
+    def destroy(self):
+        """Encerra a thread de conversão de frames junto com a janela"""
+        self._closed = True
+        _put_latest(self._frame_in, _STOP_WORKER)
+        super().destroy()
 
     def _on_closing_attempt(self):
         """
@@ -331,13 +534,14 @@ class CameraView(ctk.CTkToplevel):
         Impede o fechamento se a detecção estiver ativa.
         """
         if self.is_detection_active:
-            # Mostra aviso
-            messagebox.showwarning(
+            # Mostra aviso (sem bloquear: o vídeo continua atualizando)
+            show_message(
+                self,
                 "Detecção Ativa",
-                "Por favor, pare a detecção antes de fechar a janela.",
-                parent=self
+                "Por favor, pare a detecção antes de fechar a janela."
             )
             # Não fecha a janela
+        elif self.on_close is not None:
+            self.on_close(self.camera_id)  # O ScreenManager esconde a janela para reuso
         else:
-            # Permite fechar
-            self.destroy()  # Aciona o callback do ScreenManager
\ No newline at end of file
+            self.destroy()
\ No newline at end of file
@@ -2,10 +2,79 @@
 Componentes de UI reutilizáveis
 """
 import customtkinter as ctk
+import tkinter as tk
+from contextlib import contextmanager
 from typing import Optional, Callable, Any
 from tkinter import messagebox
 
 
+# Cor por tipo de status/aviso, compartilhada por CameraCard e NotificationToast
+STATUS_COLORS = {
+    "success": "#3BA776",
+    "warning": "#E8A23B",
+    "error": "#C24E4E",
+    "info": "#4A90A4"
+}
+
+
+@contextmanager
+def batched_ui(widget):
+    """
+    Cria/reposiciona vários filhos com `widget` fora da tela: ao sair, ele volta ao
+    mesmo lugar (pack, grid ou place) e o Tk calcula o layout e desenha o conjunto
+    uma vez, em vez de a cada filho mapeado.
+    """
+    manager = widget.winfo_manager()
+    # Widgets CTk guardam a última chamada de pack/grid/place para reaplicá-la ao mudar a escala;
+    # os *_forget abaixo a apagam, então ela é devolvida no fim
+    last_call = getattr(widget, "_last_geometry_manager_call", None)
+    info, following = None, []
+    if manager == "pack":
+        info = widget.pack_info()
+        slaves = widget.master.pack_slaves()
+        following = slaves[slaves.index(widget) + 1:]  # Preserva a ordem de empacotamento
+        widget.pack_forget()
+    elif manager == "grid":
+        widget.grid_remove()  # O grid guarda as opções
+    elif manager == "place":
+        info = widget.place_info()
+        widget.place_forget()
+    try:
+        yield widget
+    finally:
+        if manager == "pack":
+            if following:
+                info["before"] = following[0]
+            widget.pack_configure(info)
+        elif manager == "grid":
+            widget.grid()
+        elif manager == "place":
+            widget.place_configure(info)
+        if last_call is not None:
+            widget._last_geometry_manager_call = last_call
+        widget.update_idletasks()
+
+
+def add_bindtag(widget, tag: str) -> None:
+    """
+    Coloca `tag` na frente das bindtags dos widgets Tk folha de `widget`. Widgets
+    CTk repassam bind() para canvas/labels/entries internos; com a tag, um único
+    bind_class(tag, ...) atende todos eles.
+    """
+    widgets = list(widget.winfo_children()) or [widget]
+    for child in widgets:
+        children = child.winfo_children()
+        if children:
+            widgets.extend(children)
+        else:  # Só as folhas recebem os eventos (o resto fica coberto por elas)
+            child.bindtags((tag,) + child.bindtags())
+
+
+def _merge_styles(defaults: dict, styles: dict) -> dict:
+    """Combina uma vez os padrões com cada estilo ({nome: {**padrões, **estilo}})"""
+    return {name: {**defaults, **style} for name, style in styles.items()}
+
+
 class ModernButton(ctk.CTkButton):
     """Botão moderno com estilos pré-definidos"""
     
@@ -18,42 +87,39 @@ class ModernButton(ctk.CTkButton):
         "outline": {"fg_color": "transparent", "border_color": "#4A90A4", "border_width": 2}
     }
     
+    # Configurações padrão (criadas uma vez; a fonte fica em tupla porque o CTk
+    # só aceita tupla ou CTkFont, e este exige uma janela raiz já criada)
+    DEFAULTS = {
+        "font": ("Arial", 14, "bold"),
+        "text_color": "white",
+        "corner_radius": 8,
+        "height": 40
+    }
+    _FULL_STYLES = _merge_styles(DEFAULTS, STYLES)
+    
     def __init__(self, master, text: str, style: str = "primary", 
                  command: Optional[Callable] = None, **kwargs):
-        
-        # Aplica estilo
-        style_config = self.STYLES.get(style, self.STYLES["primary"])
-        kwargs.update(style_config)
-        
-        # Configurações padrão
-        default_config = {
-            "text": text,
-            "command": command,
-            "font": ("Arial", 14, "bold"),
-            "text_color": "white",
-            "corner_radius": 8,
-            "height": 40
-        }
-        default_config.update(kwargs)
-        
-        super().__init__(master, **default_config)
+        # Precedência: estilo > kwargs > padrões. Sem kwargs, usa o dict já combinado
+        if kwargs:
+            config = {**self.DEFAULTS, **kwargs, **self.STYLES.get(style, self.STYLES["primary"])}
+        else:
+            config = self._FULL_STYLES.get(style, self._FULL_STYLES["primary"])
+        super().__init__(master, text=text, command=command, **config)
 
 
 class ModernEntry(ctk.CTkEntry):
     """Campo de entrada moderno"""
     
+    DEFAULTS = {
+        "font": ("Arial", 14),
+        "height": 40,
+        "corner_radius": 8,
+        "border_width": 2,
+        "border_color": "#555555"
+    }
+    
     def __init__(self, master, placeholder_text: str = "", **kwargs):
-        default_config = {
-            "placeholder_text": placeholder_text,
-            "font": ("Arial", 14),
-            "height": 40,
-            "corner_radius": 8,
-            "border_width": 2,
-            "border_color": "#555555"
-        }
-        default_config.update(kwargs)
-        
-        super().__init__(master, **default_config)
+        super().__init__(master, placeholder_text=placeholder_text, **{**self.DEFAULTS, **kwargs})
 
 
 class ModernLabel(ctk.CTkLabel):
@@ -72,15 +138,16 @@ class ModernLabel(ctk.CTkLabel):
     
     def __init__(self, master, text: str, style: str = "body", **kwargs):
         style_config = self.STYLES.get(style, self.STYLES["body"])
-        kwargs.update(style_config)
-        kwargs["text"] = text
-        
-        super().__init__(master, **kwargs)
+        # Estilo sobrepõe kwargs; sem kwargs, o dict do estilo vai direto
+        super().__init__(master, text=text, **({**kwargs, **style_config} if kwargs else style_config))
 
 
 class CameraCard(ctk.CTkFrame):
     """Card de câmera com informações e controles"""
     
+    CLICK_TAG = "CameraCardClick"
+    _click_tag_bound = False  # bind_class feito uma vez por processo
+    
     def __init__(self, master, camera_id: int, camera_name: str, 
                  on_click: Optional[Callable] = None, **kwargs):
         
@@ -94,6 +161,9 @@ class CameraCard(ctk.CTkFrame):
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         
+        # Os labels continuam CTk (e não Tk puro via tk.call): precisam da escala de DPI e das
+        # cores do CTk para combinar com o card. O custo de criação é amortizado pelo reuso dos
+        # cards no dashboard (diff + cards escondidos), então só a primeira exibição o paga.
         # Label principal
         self.title_label = ModernLabel(
             self, text=f"Câmera {camera_id}", 
@@ -114,137 +184,160 @@ class CameraCard(ctk.CTkFrame):
             style="warning"
         )
         self.status_label.grid(row=2, column=0, pady=(0, 20), sticky="nsew")
+        self._status = ("Desconectada", "warning")  # (texto, tipo) aplicados ao label (estilo "warning")
         
-        # Bind click events
-        self.bind("<Button-1>", self._on_click)
-        self.title_label.bind("<Button-1>", self._on_click)
-        self.name_label.bind("<Button-1>", self._on_click)
-        self.status_label.bind("<Button-1>", self._on_click)
+        # Clique: os widgets Tk internos (canvas/labels criados pelo CTk) recebem a
+        # bindtag compartilhada, com um único bind_class para todos os cards
+        if not CameraCard._click_tag_bound:
+            self.bind_class(self.CLICK_TAG, "<Button-1>", CameraCard._on_tag_click)
+            CameraCard._click_tag_bound = True
+        add_bindtag(self, self.CLICK_TAG)
         
-        # Cursor pointer
+        # Cursor pointer (herdado pelos filhos, que não definem cursor próprio)
         self.configure(cursor="hand2")
-        self.title_label.configure(cursor="hand2")
-        self.name_label.configure(cursor="hand2")
-        self.status_label.configure(cursor="hand2")
+
+    @staticmethod
+    def _on_tag_click(event):
+        """Encaminha o clique de qualquer widget interno para o card que o contém"""
+        widget = event.widget
+        while widget is not None and not isinstance(widget, CameraCard):
+            widget = getattr(widget, "master", None)
+        if widget is not None:
+            widget._on_click(event)
     
     def _on_click(self, event):
         """Callback para clique no card"""
         if self.on_click:
             self.on_click(self.camera_id)
     
+    STATUS_COLORS = STATUS_COLORS
+    
     def update_status(self, status: str, status_type: str = "warning"):
-        """Atualiza status da câmera"""
-        self.status_label.configure(text=status)
-        
-        # Atualiza cor baseada no tipo
-        colors = {
-            "success": "#3BA776",
-            "warning": "#E8A23B", 
-            "error": "#C24E4E",
-            "info": "#4A90A4"
-        }
-        
-        color = colors.get(status_type, "#E8A23B")
-        self.status_label.configure(text_color=color)
+        """Atualiza status da câmera (texto e cor num único configure; repetido, não redesenha)"""
+        if status == self._status[0] and status_type == self._status[1]:
+            return  # Caminho comum: nem consulta a cor
+        self._status = (status, status_type)
+        color = self.STATUS_COLORS.get(status_type, STATUS_COLORS["warning"])
+        self.status_label.configure(text=status, text_color=color)
 
 
 class StatusBar(ctk.CTkFrame):
-    """Barra de status do sistema"""
+    """Barra de status do sistema (quem a cria faz o pack, depois de montar os filhos)"""
     
     def __init__(self, master, **kwargs):
         super().__init__(master, fg_color="#555555", height=30, **kwargs)
         
-        self.pack(fill="x", side="bottom")
+        # Textos em StringVar: atualizar é um único `set` no Tcl, sem configure do label
+        self._system_var = tk.StringVar(master=self, value="Sistema iniciado")
+        self._user_var = tk.StringVar(master=self, value="")
         
         # Status do sistema
         self.system_status = ModernLabel(
-            self, text="Sistema iniciado", 
+            self, text="", textvariable=self._system_var,
             style="caption"
         )
         self.system_status.pack(side="left", padx=10, pady=5)
         
         # Usuário atual
         self.user_label = ModernLabel(
-            self, text="", 
+            self, text="", textvariable=self._user_var,
             style="caption"
         )
         self.user_label.pack(side="right", padx=10, pady=5)
     
     def update_system_status(self, status: str):
         """Atualiza status do sistema"""
-        self.system_status.configure(text=status)
+        self._system_var.set(status)
     
     def update_user(self, username: str):
         """Atualiza usuário atual"""
-        self.user_label.configure(text=f"Usuário: {username}")
+        self._user_var.set(f"Usuário: {username}")
 
 
 class LoadingSpinner(ctk.CTkFrame):
-    """Spinner de carregamento"""
-    
+    """
+    Spinner de carregamento. Um único timer (TICK_MS) anima todos os spinners
+    existentes e pula os que não estão visíveis; ele para quando não há nenhum.
+    """
+
+    TICK_MS = 500
+    _active: set = set()  # Compartilhado entre instâncias
+    _tick_id = None
+    _tick_owner = None  # Widget em que o after() do timer foi agendado
+
     def __init__(self, master, text: str = "Carregando...", **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         
         self.label = ModernLabel(self, text=text, style="body")
         self.label.pack(pady=20)
-        
-        # Animação simples (pode ser melhorada)
-        self.animation_id = None
-        self._animate()
-    
+        # Quadros da animação: texto base + 0..3 pontos; começa no quadro do texto recebido
+        base = text.rstrip(".")
+        self._frames = tuple(base + "." * dots for dots in range(4))
+        self._idx = min(len(text) - len(base), 3)
+
+        LoadingSpinner._active.add(self)
+        LoadingSpinner._ensure_timer()
+
+    @classmethod
+    def _ensure_timer(cls):
+        """Agenda o próximo tick se há spinners e nenhum tick pendente"""
+        if cls._tick_id is None and cls._active:
+            cls._tick_owner = next(iter(cls._active))
+            cls._tick_id = cls._tick_owner.after(cls.TICK_MS, cls._tick)
+
+    @classmethod
+    def _tick(cls):
+        """Avança um passo da animação de cada spinner visível"""
+        cls._tick_id = None
+        for spinner in tuple(cls._active):
+            if spinner.winfo_viewable():
+                spinner._animate()
+        cls._ensure_timer()
+
     def _animate(self):
-        """Animação do spinner"""
-        current_text = self.label.cget("text")
-        if current_text.endswith("..."):
-            new_text = current_text[:-3]
-        else:
-            new_text = current_text + "."
-        
-        self.label.configure(text=new_text)
-        self.animation_id = self.after(500, self._animate)
+        """Animação do spinner: avança para o próximo quadro pré-montado"""
+        self._idx = (self._idx + 1) & 3
+        self.label.configure(text=self._frames[self._idx])
     
     def destroy(self):
-        """Destrói o spinner"""
-        if self.animation_id:
-            self.after_cancel(self.animation_id)
+        """Destrói o spinner (e muda o timer de dono, se era ele)"""
+        LoadingSpinner._active.discard(self)
+        if LoadingSpinner._tick_owner is self and LoadingSpinner._tick_id is not None:
+            self.after_cancel(LoadingSpinner._tick_id)
+            LoadingSpinner._tick_id = LoadingSpinner._tick_owner = None
+            LoadingSpinner._ensure_timer()
         super().destroy()
 
 
 class NotificationToast(ctk.CTkToplevel):
-    """Toast de notificação"""
+    """
+    Toast de notificação. Uma única janela é criada (ver show_notification) e
+    reaproveitada: cada aviso só troca cor/texto, mostra e agenda o esconder.
+    """
     
-    def __init__(self, master, message: str, notification_type: str = "info", 
-                 duration: int = 3000):
-        
+    COLORS = STATUS_COLORS
+    FADE_STEPS = 10
+    FADE_INTERVAL_MS = 50
+    
+    def __init__(self, master):
         super().__init__(master)
         
-        self.duration = duration
-        
         # Configuração da janela
         self.title("")
         self.configure(fg_color="#2B2B2B")
         self.overrideredirect(True)
-        
-        # Cores baseadas no tipo
-        colors = {
-            "success": "#3BA776",
-            "error": "#C24E4E",
-            "warning": "#E8A23B",
-            "info": "#4A90A4"
-        }
-        
-        color = colors.get(notification_type, "#4A90A4")
+        self.withdraw()  # Só aparece em show()
         
         # Frame principal
-        main_frame = ctk.CTkFrame(self, fg_color=color, corner_radius=8)
-        main_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        self.main_frame = ctk.CTkFrame(self, fg_color=self.COLORS["info"], corner_radius=8)
+        self.main_frame.pack(padx=10, pady=10, fill="both", expand=True)
         
         # Mensagem
-        message_label = ModernLabel(
-            main_frame, text=message, 
+        self.message_label = ModernLabel(
+            self.main_frame, text="", 
             style="body"
         )
-        message_label.pack(pady=15, padx=20)
+        self.message_label.pack(pady=15, padx=20)
         
         # Posiciona no canto superior direito
         self.geometry("300x80+{}+{}".format(
@@ -252,40 +345,141 @@ class NotificationToast(ctk.CTkToplevel):
             50
         ))
         
-        # Auto-destruição
-        self.after(duration, self.destroy)
+        self._visible = False
+        self._color = self.COLORS["info"]
+        self._hide_id = None
+        self._fade_id = None
+    
+    def show(self, message: str, notification_type: str = "info", duration: int = 3000):
+        """Exibe a mensagem por `duration` ms (reinicia o tempo se já estiver visível)"""
+        color = self.COLORS.get(notification_type, STATUS_COLORS["info"])
+        if color != self._color:
+            self._color = color
+            self.main_frame.configure(fg_color=color)
+        self.message_label.configure(text=message)
+        
+        if self._hide_id is not None:
+            self.after_cancel(self._hide_id)
+        self._hide_id = self.after(duration, self._hide)
         
-        # Fade in effect
-        self.attributes("-alpha", 0)
-        self._fade_in()
+        if not self._visible:  # Já visível: só troca o texto, sem repetir o fade in
+            self._visible = True
+            self.attributes("-alpha", 0)
+            self.deiconify()
+            self._fade_id = self.after(self.FADE_INTERVAL_MS, self._fade_in)
+        self.lift()
+    
+    def _hide(self):
+        """Esconde a janela (mantida para o próximo aviso)"""
+        self._hide_id = None
+        self._visible = False
+        if self._fade_id is not None:  # Escondido no meio do fade
+            self.after_cancel(self._fade_id)
+            self._fade_id = None
+        self.withdraw()
     
-    def _fade_in(self):
-        """Efeito de fade in"""
-        alpha = self.attributes("-alpha")
-        if alpha < 1.0:
-            alpha += 0.1
-            self.attributes("-alpha", alpha)
-            self.after(50, self._fade_in)
+    def _fade_in(self, step: int = 1):
+        """Efeito de fade in: alpha calculado do passo (sem ler o atributo de volta do Tk)"""
+        self.attributes("-alpha", step / self.FADE_STEPS)
+        if step < self.FADE_STEPS:
+            self._fade_id = self.after(self.FADE_INTERVAL_MS, self._fade_in, step + 1)
+        else:
+            self._fade_id = None
+
+
+_toast_singleton: Optional[NotificationToast] = None
+
+
+class MessageDialog(ctk.CTkToplevel):
+    """
+    Diálogo simples (mensagem + botões) que não bloqueia o loop do Tk: o
+    resultado chega por callback, então vídeo e demais atualizações continuam.
+    """
+
+    def __init__(self, master, title: str, message: str,
+                 buttons: list, on_result: Optional[Callable[[Any], None]] = None):
+        super().__init__(master)
+        self.on_result = on_result
+        self._previous_grab = master.grab_current()  # Devolvido ao fechar (ex.: CameraView)
+
+        self.title(title)
+        self.configure(fg_color="#2B2B2B")
+        self.resizable(False, False)
+        self.transient(master)
+
+        ModernLabel(self, text=message, style="body", wraplength=360).pack(padx=20, pady=(20, 10))
+        buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
+        buttons_frame.pack(padx=20, pady=(0, 20))
+        for text, style, result in buttons:
+            ModernButton(buttons_frame, text=text, style=style, width=110,
+                         command=lambda r=result: self._finish(r)).pack(side="left", padx=5)
+
+        self.protocol("WM_DELETE_WINDOW", lambda: self._finish(None))
+        self.after(10, self._grab)  # Toplevel precisa estar visível para receber o grab
+
+    def _grab(self):
+        if self.winfo_exists():
+            self.grab_set()
+
+    def _finish(self, result: Any):
+        previous_grab = self._previous_grab
+        self.destroy()
+        if previous_grab is not None and previous_grab.winfo_exists():
+            previous_grab.grab_set()
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+def ask_yes_no(master, title: str, message: str, on_result: Callable[[bool], None]) -> MessageDialog:
+    """Pergunta Sim/Não sem bloquear; on_result recebe True/False (fechar a janela = False)"""
+    return MessageDialog(master, title, message,
+                         [("Sim", "primary", True), ("Não", "secondary", False)],
+                         lambda result: on_result(bool(result)))
+
+
+def show_message(master, title: str, message: str, style: str = "warning") -> MessageDialog:
+    """Aviso com botão OK, sem bloquear o loop do Tk"""
+    return MessageDialog(master, title, message, [("OK", style, None)])
 
 
 def show_notification(master, message: str, notification_type: str = "info", 
                      duration: int = 3000):
-    """Função helper para mostrar notificação"""
-    toast = NotificationToast(master, message, notification_type, duration)
-    return toast
+    """Função helper para mostrar notificação (reaproveita a janela do toast)"""
+    global _toast_singleton
+    if _toast_singleton is None or not _toast_singleton.winfo_exists():
+        # Filho da raiz: sobrevive ao fechamento da janela que pediu o aviso
+        _toast_singleton = NotificationToast(master.nametowidget("."))
+    _toast_singleton.show(message, notification_type, duration)
+    return _toast_singleton
+
+
+# Janela (raiz) dona dos diálogos de show_*_dialog; definida pelo ScreenManager
+_dialog_master = None
+
+
+def set_dialog_master(master) -> None:
+    """Define a janela usada pelos diálogos de erro/sucesso/aviso"""
+    global _dialog_master
+    _dialog_master = master
+
+
+def _show_dialog(title: str, message: str, style: str, fallback: Callable[[str, str], Any]):
+    """Diálogo sem bloquear o loop do Tk; antes de haver janela, usa o messagebox nativo"""
+    if _dialog_master is None or not _dialog_master.winfo_exists():
+        return fallback(title, message)
+    return show_message(_dialog_master, title, message, style)
 
 
 def show_error_dialog(title: str, message: str):
     """Mostra diálogo de erro"""
-    messagebox.showerror(title, message)
+    return _show_dialog(title, message, "danger", messagebox.showerror)
 
 
 def show_success_dialog(title: str, message: str):
     """Mostra diálogo de sucesso"""
-    messagebox.showinfo(title, message)
+    return _show_dialog(title, message, "success", messagebox.showinfo)
 
 
 def show_warning_dialog(title: str, message: str):
     """Mostra diálogo de aviso"""
-    messagebox.showwarning(title, message)
-
+    return _show_dialog(title, message, "warning", messagebox.showwarning)
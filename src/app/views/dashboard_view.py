@@ -2,14 +2,25 @@
 Tela principal (dashboard) refatorada
 """
 import customtkinter as ctk
-from typing import Callable, List, Dict, Any
+import tkinter as tk
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, Callable, List, Dict
 
 from .components import (
     ModernButton, ModernLabel, CameraCard, StatusBar,
-    show_notification, show_error_dialog
+    batched_ui, show_notification, show_error_dialog
 )
 
 
+CAMERA_GRID_COLUMNS = 3
+HIDDEN_CARDS_MAX = 64  # Cards escondidos guardados para reuso; acima disso os mais antigos são destruídos
+
+
+# (texto, tipo) do status exibido no card, por detecção ativa/inativa
+_CAMERA_STATUS = {True: ("Detecção Ativa", "success"), False: ("Inativa/Desconectada", "warning")}
+
+
 class DashboardView(ctk.CTkFrame):
     """Tela principal do sistema"""
 
@@ -24,6 +35,13 @@ class DashboardView(ctk.CTkFrame):
         self.on_logout = on_logout
         self.on_settings_click = on_settings_click  # <--- 2. SALVE O CALLBACK
         self.camera_cards: Dict[int, CameraCard] = {}
+        # (nome, (status, tipo), (linha, coluna)) aplicados a cada card, para reconfigurar só o que mudou
+        self._camera_state: Dict[int, tuple] = {}
+        # Cards de câmeras que saíram da lista: escondidos (grid_remove) e reaproveitados se voltarem
+        self._hidden_cards: "OrderedDict[int, CameraCard]" = OrderedDict()
+        # Atualizações de status recebidas no mesmo ciclo do loop: só a última de cada alvo é aplicada
+        self._pending_updates: Dict[Any, Any] = {}
+        self._flush_scheduled = False
 
         self._create_ui()
 
@@ -35,8 +53,9 @@ class DashboardView(ctk.CTkFrame):
         # Conteúdo principal
         self._create_main_content()
 
-        # Barra de status
+        # Barra de status: mapeada já com os labels criados (último pack, como antes)
         self.status_bar = StatusBar(self)
+        self.status_bar.pack(fill="x", side="bottom")
 
     def _create_top_bar(self):
         """Cria barra superior"""
@@ -56,9 +75,11 @@ class DashboardView(ctk.CTkFrame):
         self.user_info_frame = ctk.CTkFrame(self.top_bar, fg_color="transparent")
         self.user_info_frame.pack(side="right", padx=20, pady=15)
 
+        self._user_var = tk.StringVar(master=self, value="")  # update_user_info só faz set()
         self.user_label = ModernLabel(
             self.user_info_frame,
             text="",
+            textvariable=self._user_var,
             style="body"
         )
         self.user_label.pack(side="right", padx=(0, 15))
@@ -115,50 +136,99 @@ class DashboardView(ctk.CTkFrame):
     def update_user_info(self, username: str, role: str = ""):
         """Atualiza informações do usuário"""
         role_text = f" ({role})" if role else ""
-        self.user_label.configure(text=f"Bem-vindo, {username}{role_text}")
+        self._user_var.set(f"Bem-vindo, {username}{role_text}")
         self.status_bar.update_user(username)
 
-    def update_cameras(self, cameras: List[Dict[str, Any]]):
-        """Atualiza lista de câmeras"""
-        # Limpa cards antigos
-        for card in self.camera_cards.values():
-            card.destroy()
-        self.camera_cards.clear()
-
-        # Filtra apenas câmeras habilitadas
-        enabled_cameras = [cam for cam in cameras if cam.get('enabled', True)]
-
-        # Cria novos cards
-        for i, camera in enumerate(enabled_cameras):
-            row = i // 3
-            col = i % 3
-
-            card = CameraCard(
-                self.cameras_frame,
-                camera_id=camera['id'],
-                camera_name=camera['name'],
-                on_click=self._handle_camera_click
-            )
-
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            self.camera_cards[camera['id']] = card
-
-            # Atualiza status (se a detecção está ativa ou não)
-            if camera.get('is_active', False):
-                card.update_status("Detecção Ativa", "success")
-            elif camera.get('status') and camera['status']['is_connected']:
-                card.update_status("Conectada", "info")
+    def update_cameras(self, ids: List[int], names: List[str], is_active: List[bool]):
+        """
+        Atualiza a grade de câmeras reaproveitando os cards existentes: cria só os
+        novos, reconfigura só o que mudou e esconde (para reuso) os que saíram da lista.
+        Recebe só as câmeras habilitadas, em listas paralelas (ver
+        AppController.get_dashboard_cameras).
+        """
+        # Cards novos ou removidos: monta a grade fora da tela (um único layout); senão, nada a agrupar
+        regrid = set(ids) != self.camera_cards.keys()
+        with batched_ui(self.cameras_frame) if regrid else nullcontext():
+            self._apply_cameras(ids, names, is_active)
+
+    def _apply_cameras(self, ids: List[int], names: List[str], is_active: List[bool]):
+        """Cria, reconfigura e esconde cards conforme as listas (ver update_cameras)"""
+        self._flush_ui_updates()  # Status pendentes antes da lista nova: mantém a ordem das atualizações
+        seen = set()
+        for i, camera_id in enumerate(ids):
+            seen.add(camera_id)
+            state = (names[i], _CAMERA_STATUS[is_active[i]], divmod(i, CAMERA_GRID_COLUMNS))
+
+            card = self.camera_cards.get(camera_id)
+            if card is None and camera_id in self._hidden_cards:
+                card = self.camera_cards[camera_id] = self._hidden_cards.pop(camera_id)
+                old_state = self._camera_state.get(camera_id)  # Posição None: volta ao grid abaixo
+            elif card is None:
+                card = CameraCard(
+                    self.cameras_frame,
+                    camera_id=camera_id,
+                    camera_name=names[i],
+                    on_click=self._handle_camera_click
+                )
+                self.camera_cards[camera_id] = card
+                old_state = None
             else:
-                card.update_status("Inativa/Desconectada", "warning")
+                old_state = self._camera_state.get(camera_id)
+                if old_state == state:
+                    continue  # Nada mudou: nenhum configure
+
+            name, status, (row, col) = state
+            if old_state is None or old_state[2] != state[2]:
+                card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+            if old_state is not None and old_state[0] != name:
+                card.name_label.configure(text=name)
+            if old_state is None or old_state[1] != status:
+                card.update_status(*status)
+            self._camera_state[camera_id] = state
+
+        # Esconde os cards de câmeras que saíram (ou foram desabilitadas), guardando-os para reuso
+        for camera_id in [cid for cid in self.camera_cards if cid not in seen]:
+            card = self.camera_cards.pop(camera_id)
+            card.grid_remove()
+            self._hidden_cards[camera_id] = card
+            name, status, _ = self._camera_state[camera_id]
+            self._camera_state[camera_id] = (name, status, None)
+        while len(self._hidden_cards) > HIDDEN_CARDS_MAX:
+            camera_id, card = self._hidden_cards.popitem(last=False)
+            card.destroy()
+            self._camera_state.pop(camera_id, None)
 
     def _handle_camera_click(self, camera_id: int):
         """Processa clique em câmera"""
         self.on_camera_click(camera_id)
 
     def update_camera_status(self, camera_id: int, status: str, status_type: str = "warning"):
-        """Atualiza status de uma câmera específica"""
-        if camera_id in self.camera_cards:
-            self.camera_cards[camera_id].update_status(status, status_type)
+        """Atualiza status de uma câmera específica (aplicado no próximo idle, junto com os demais)"""
+        self._queue_ui_update(("camera", camera_id), (status, status_type))
+
+    def _queue_ui_update(self, key, value):
+        """Guarda a atualização (a mais recente por alvo vence) e agenda um único flush"""
+        self._pending_updates[key] = value
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_ui_updates)
+
+    def _flush_ui_updates(self):
+        """Aplica de uma vez as atualizações de status pendentes"""
+        self._flush_scheduled = False
+        if not self._pending_updates:
+            return
+        pending, self._pending_updates = self._pending_updates, {}
+        for key, value in pending.items():
+            if key == "system":
+                self.status_bar.update_system_status(value)
+                continue
+            camera_id = key[1]
+            if camera_id in self.camera_cards:
+                self.camera_cards[camera_id].update_status(*value)
+                state = self._camera_state.get(camera_id)
+                if state is not None:  # Mantém o diff de update_cameras coerente com o card
+                    self._camera_state[camera_id] = (state[0], value, state[2])
 
     def show_notification(self, message: str, notification_type: str = "info"):
         """Mostra notificação"""
@@ -169,5 +239,5 @@ class DashboardView(ctk.CTkFrame):
         show_error_dialog("Erro", message)
 
     def update_system_status(self, status: str):
-        """Atualiza status do sistema"""
-        self.status_bar.update_system_status(status)
\ No newline at end of file
+        """Atualiza status do sistema (aplicado no próximo idle)"""
+        self._queue_ui_update("system", status)
\ No newline at end of file
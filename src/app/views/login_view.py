@@ -5,7 +5,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 from typing import Callable
 
-from .components import ModernButton, ModernEntry, ModernLabel, show_error_dialog
+from .components import ModernButton, ModernEntry, ModernLabel, add_bindtag, show_error_dialog
 
 
 class LoginView(ctk.CTkFrame):
@@ -16,14 +16,18 @@ class LoginView(ctk.CTkFrame):
         
         self.on_login = on_login
         self.on_register = on_register
-        
-        self._create_ui()
+        self._built = False  # Widgets criados só quando a tela é mostrada (ensure_ui)
+    
+    def ensure_ui(self):
+        """Cria os widgets na primeira exibição (chamado pelo ScreenManager antes de mapear)"""
+        if not self._built:
+            self._built = True
+            self._create_ui()
     
     def _create_ui(self):
         """Cria interface do usuário"""
         # Frame central
         self.center_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.center_frame.place(relx=0.5, rely=0.5, anchor="center")
         
         # Logo/Título
         self.title_label = ModernLabel(
@@ -83,9 +87,13 @@ class LoginView(ctk.CTkFrame):
         )
         self.register_button.pack(pady=(0, 20), padx=30)
         
-        # Bind Enter key
-        self.password_entry.bind("<Return>", lambda e: self._handle_login())
-        self.username_entry.bind("<Return>", lambda e: self._handle_login())
+        # Só mapeia o frame com o formulário completo: um único layout/desenho
+        self.center_frame.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Enter em qualquer campo envia: um único bind_class para a tag do formulário
+        self.form_frame.bind_class("LoginForm", "<Return>", lambda e: self._handle_login())
+        for entry in (self.username_entry, self.password_entry):
+            add_bindtag(entry, "LoginForm")
     
     def _handle_login(self):
         """Processa tentativa de login"""
@@ -104,11 +112,15 @@ class LoginView(ctk.CTkFrame):
     
     def clear_fields(self):
         """Limpa campos do formulário"""
+        if not self._built:
+            return  # Tela nunca mostrada: nada a limpar
         self.username_entry.delete(0, "end")
         self.password_entry.delete(0, "end")
     
     def focus_username(self):
         """Foca no campo de usuário"""
+        if not self._built:
+            return
         self.username_entry.focus()
 
     def show_error(self, message: str):
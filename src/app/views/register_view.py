@@ -2,10 +2,9 @@
 Tela de registro refatorada
 """
 import customtkinter as ctk
-from tkinter import messagebox
 from typing import Callable
 
-from .components import ModernButton, ModernEntry, ModernLabel, show_error_dialog
+from .components import ModernButton, ModernEntry, ModernLabel, add_bindtag, show_error_dialog, show_success_dialog
 
 
 class RegisterView(ctk.CTkFrame):
@@ -16,14 +15,18 @@ class RegisterView(ctk.CTkFrame):
 
         self.on_register = on_register
         self.on_back = on_back
+        self._built = False  # Widgets criados só quando a tela é mostrada (ensure_ui)
 
-        self._create_ui()
+    def ensure_ui(self):
+        """Cria os widgets na primeira exibição (chamado pelo ScreenManager antes de mapear)"""
+        if not self._built:
+            self._built = True
+            self._create_ui()
 
     def _create_ui(self):
         """Cria interface do usuário"""
         # Frame central
         self.center_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.center_frame.place(relx=0.5, rely=0.5, anchor="center")
 
         # Título
         self.title_label = ModernLabel(
@@ -91,10 +94,13 @@ class RegisterView(ctk.CTkFrame):
         )
         self.back_button.pack(pady=(0, 20), padx=30)
 
-        # Bind Enter key
-        self.confirm_password_entry.bind("<Return>", lambda e: self._handle_register())
-        self.password_entry.bind("<Return>", lambda e: self._handle_register())
-        self.username_entry.bind("<Return>", lambda e: self._handle_register())
+        # Só mapeia o frame com o formulário completo: um único layout/desenho
+        self.center_frame.place(relx=0.5, rely=0.5, anchor="center")
+
+        # Enter em qualquer campo envia: um único bind_class para a tag do formulário
+        self.form_frame.bind_class("RegisterForm", "<Return>", lambda e: self._handle_register())
+        for entry in (self.username_entry, self.password_entry, self.confirm_password_entry):
+            add_bindtag(entry, "RegisterForm")
 
     def _handle_register(self):
         """Processa tentativa de registro"""
@@ -127,12 +133,16 @@ class RegisterView(ctk.CTkFrame):
 
     def clear_fields(self):
         """Limpa campos do formulário"""
+        if not self._built:
+            return  # Tela nunca mostrada: nada a limpar
         self.username_entry.delete(0, "end")
         self.password_entry.delete(0, "end")
         self.confirm_password_entry.delete(0, "end")
 
     def focus_username(self):
         """Foca no campo de usuário"""
+        if not self._built:
+            return
         self.username_entry.focus()
 
         # --- INÍCIO DAS ADIÇÕES ---
@@ -143,10 +153,8 @@ class RegisterView(ctk.CTkFrame):
 
     def show_notification(self, message: str, type: str = "info"):
         """Exibe uma notificação (chamado pelo ScreenManager)"""
-        # Você pode melhorar isso depois (ex: usar um label),
-        # mas por enquanto, um messagebox serve.
         if type == "success":
-            messagebox.showinfo("Sucesso", message)
+            show_success_dialog("Sucesso", message)
         else:
-            messagebox.showinfo("Informação", message)
+            show_success_dialog("Informação", message)
             # --- FIM DAS ADIÇÕES ---
@@ -3,19 +3,67 @@ Gerenciador de telas da aplicação
 """
 
 import customtkinter as ctk
-import tkinter  # Importa a biblioteca base do tkinter para o TclError
-from typing import Optional, Dict, Any
+import queue
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple, Callable
+from weakref import WeakValueDictionary
 
 from .login_view import LoginView
 from .register_view import RegisterView
 from .dashboard_view import DashboardView
 from .camera_view import CameraView
 from .settings_view import SettingsView
-from ..controllers.app_controller import AppController
+from ..controllers.app_controller import AppController, UIEvent
 # --- ADICIONADO: Importa CargoType e User ---
 from ..models.entities import CargoType, User
 # --- FIM ADIÇÃO ---
-from .components import show_error_dialog
+from .components import set_dialog_master, show_error_dialog
+from ..utils.logger import get_logger
+
+# Mensagens de diagnóstico da UI: o logger só enfileira (QueueHandler) e a escrita no
+# console/arquivo fica na thread do listener, fora do loop do Tk
+_log = get_logger("ScreenManager")
+
+UI_DRAIN_INTERVAL_MS = 16  # Intervalo de drenagem dos callbacks vindos de outras threads
+UI_DRAIN_MAX_ITEMS = 64  # Máximo de callbacks por drenagem (limita a latência do Tk)
+CAMERA_WINDOW_POOL_MAX = 4  # Janelas de câmera fechadas mantidas escondidas para reuso
+DASHBOARD_REFRESH_DEBOUNCE_MS = 100  # Rajadas de eventos de câmera viram um único refresh
+# Callbacks chamados direto na thread do produtor (Python puro, sem Tcl): frame_wanted
+# precisa responder na hora e detection_update só grava o slot lido por _drain_ui
+_DIRECT_CALLBACKS = frozenset({UIEvent.FRAME_WANTED, UIEvent.DETECTION_UPDATE})
+
+
+def _ignore_notification(message: str, notification_type: str = "info") -> None:
+    """Destino de notificação quando nenhuma tela sabe exibi-la"""
+
+
+@dataclass(frozen=True)
+class _CameraWindowCaps:
+    """
+    Destinos de erro/notificação de uma câmera, resolvidos uma vez ao abrir a janela:
+    janela da câmera -> tela de fallback (dashboard) -> diálogo de erro.
+    """
+    error_sink: Callable[[int, str], None]  # (camera_id, mensagem)
+    notify_sink: Callable[..., None]  # (mensagem, tipo)
+
+    @classmethod
+    def of(cls, window, fallback_view) -> "_CameraWindowCaps":
+        if hasattr(window, 'show_error'):
+            error_sink = lambda camera_id, message: window.show_error(message)
+        elif hasattr(fallback_view, 'show_error'):
+            error_sink = lambda camera_id, message: fallback_view.show_error(f"Câmera {camera_id}: {message}")
+        else:
+            error_sink = lambda camera_id, message: show_error_dialog(f"Erro Câmera {camera_id}", message)
+
+        if hasattr(window, 'show_notification'):
+            notify_sink = window.show_notification
+        elif hasattr(fallback_view, 'show_notification'):
+            notify_sink = fallback_view.show_notification
+        else:
+            notify_sink = _ignore_notification
+        return cls(error_sink=error_sink, notify_sink=notify_sink)
 
 
 class ScreenManager:
@@ -24,74 +72,116 @@ class ScreenManager:
     def __init__(self, root: ctk.CTk, controller: AppController):
         self.root = root
         self.controller = controller
+        set_dialog_master(root)  # Diálogos de erro/sucesso sem messagebox bloqueante
         self.current_view: Optional[ctk.CTkFrame] = None
         # Mapeia camera_id para a instância da janela CameraView
-        self.camera_windows: Dict[int, CameraView] = {}
+        # (referência fraca: uma janela destruída some daqui sem limpeza manual)
+        self.camera_windows: "WeakValueDictionary[int, CameraView]" = WeakValueDictionary()
+        self._cam_caps: Dict[int, _CameraWindowCaps] = {}  # Mesmas chaves de camera_windows
+        # Janelas fechadas (escondidas) por câmera, da menos para a mais recente
+        self._cam_pool: "OrderedDict[int, CameraView]" = OrderedDict()
+        # Janelas de câmera ainda não destruídas (abertas ou no pool), mantido pelo <Destroy>
+        self._alive: Dict[int, CameraView] = {}
+        # Última (contagem, frame) recebida da detecção por câmera, ainda não exibida;
+        # escrita pela thread da detecção e aplicada por _drain_ui (sempre sob _pending_lock)
+        self._pending_update: Dict[int, Tuple[int, Optional[Any]]] = {}
+        self._pending_lock = threading.Lock()
+        # Índice id -> dados da câmera (get_cameras); só nome/enabled são lidos daqui,
+        # invalidado pelos callbacks de configuração/câmera adicionada/removida
+        self._cam_by_id: Dict[int, dict] = {}
+        self._dash_refresh_pending = False
+        # Callbacks do controller disparados fora da thread do Tk, executados por _drain_ui
+        self._ui_q: "queue.SimpleQueue[Tuple[Callable, tuple, dict]]" = queue.SimpleQueue()
+        self._tk_thread = threading.current_thread()
 
         # Configura callbacks do controller
         self._setup_controller_callbacks()
 
         # Cria telas
         self._create_views()
+        # Destinos para eventos de câmera sem janela aberta (dashboard -> diálogo)
+        self._default_caps = _CameraWindowCaps.of(None, self.dashboard_view)
 
         # Inicia com tela de login
         self.show_login()
+        self.root.after(UI_DRAIN_INTERVAL_MS, self._drain_ui)
 
     def _setup_controller_callbacks(self):
-        """Configura callbacks do controller"""
-        callbacks = {
-            "login_success": self._on_login_success,
-            "login_failed": self._on_login_failed,
-            "register_success": self._on_register_success,
-            # --- ADICIONADO: Callback para auto-registro ---
-            "self_register_success": self._on_self_register_success,
-            # --- FIM ADIÇÃO ---
-            "register_failed": self._on_register_failed,
-            "logout_success": self._on_logout_success,
-            "detection_starting": self._on_detection_starting,  # Opcional: Feedback imediato
-            "detection_started": self._on_detection_started,  # Confirmação real
-            "detection_stopped": self._on_detection_stopped,
-            "detection_failed": self._on_detection_failed,
-            "detection_update": self._on_detection_update,
-            "count_reset": self._on_count_reset,
-            "report_generated": self._on_report_generated,
-            "report_failed": self._on_report_failed,
-            "config_updated": self._on_config_updated,
-            "camera_added": self._on_camera_added,
-            "camera_removed": self._on_camera_removed,
-            "error": self._on_error,  # Erro genérico do controller
-        }
-        for event, callback in callbacks.items():
-            self.controller.set_ui_callback(event, callback)
+        """Configura callbacks do controller (UIEvent.X -> método self._on_x), num único registro"""
+        callbacks = {}
+        for event in UIEvent:
+            callback = getattr(self, f"_on_{event.key}")
+            callbacks[event] = callback if event in _DIRECT_CALLBACKS else self._marshal(callback)
+        self.controller.set_ui_callbacks(callbacks)
+
+    def _marshal(self, fn: Callable) -> Callable:
+        """Envolve um callback para que ele sempre rode na thread do Tk."""
+        def call_on_tk(*args, **kwargs):
+            if threading.current_thread() is self._tk_thread:
+                fn(*args, **kwargs)  # Já na thread do Tk: mantém a chamada síncrona
+            else:
+                self._ui_q.put((fn, args, kwargs))
+        return call_on_tk
+
+    def _drain_ui(self):
+        """
+        Na thread do Tk: aplica as atualizações de câmera pendentes, executa os
+        callbacks enfileirados por outras threads e reagenda.
+        """
+        self._apply_camera_updates()
+        for _ in range(UI_DRAIN_MAX_ITEMS):
+            try:
+                fn, args, kwargs = self._ui_q.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                _log.error(f"Erro no callback da UI {getattr(fn, '__name__', fn)}: {e}")
+        self.root.after(UI_DRAIN_INTERVAL_MS, self._drain_ui)
 
     def _create_views(self):
-        """Cria todas as telas"""
+        """Cria as telas usadas sempre; registro e configurações só quando exibidas"""
         self.login_view = LoginView(
             self.root,
             on_login=self._handle_login,
             on_register=self.show_register
         )
-        self.register_view = RegisterView(
-            self.root,
-            on_register=self._handle_register,
-            on_back=self.show_login
-        )
+        self._register_view: Optional[RegisterView] = None
+        self._settings_view: Optional[SettingsView] = None
         self.dashboard_view = DashboardView(
             self.root,
             on_camera_click=self._handle_camera_click,
             on_logout=self._handle_logout,
             on_settings_click=self.show_settings
         )
-        self.settings_view = SettingsView(
-            self.root,
-            controller=self.controller,
-            on_back=self.show_dashboard
-        )
+
+    def _get_register_view(self) -> RegisterView:
+        """Tela de registro, criada na primeira exibição"""
+        if self._register_view is None:
+            self._register_view = RegisterView(
+                self.root,
+                on_register=self._handle_register,
+                on_back=self.show_login
+            )
+        return self._register_view
+
+    def _get_settings_view(self) -> SettingsView:
+        """Tela de configurações, criada na primeira exibição (carrega a config persistida)"""
+        if self._settings_view is None:
+            self._settings_view = SettingsView(
+                self.root,
+                controller=self.controller,
+                on_back=self.show_dashboard
+            )
+        return self._settings_view
 
     def _switch_view(self, new_view: ctk.CTkFrame):
         """Alterna para nova tela"""
         if self.current_view:
             self.current_view.pack_forget()
+        if hasattr(new_view, 'ensure_ui'):
+            new_view.ensure_ui()  # Telas de login/registro montam os widgets na primeira exibição
         self.current_view = new_view
         self.current_view.pack(expand=True, fill="both")
 
@@ -104,48 +194,56 @@ class ScreenManager:
 
     def show_register(self):
         """Mostra tela de registro"""
-        self._switch_view(self.register_view)
-        if hasattr(self.register_view, 'focus_username'):
-            self.register_view.focus_username()
+        register_view = self._get_register_view()
+        self._switch_view(register_view)
+        if hasattr(register_view, 'focus_username'):
+            register_view.focus_username()
 
     def show_dashboard(self):
         """Mostra tela principal (Dashboard)"""
         self._switch_view(self.dashboard_view)
         user = self.controller.get_current_user()
         if user and hasattr(self.dashboard_view, 'update_user_info'):
-            role = user.role.value if hasattr(user.role, 'value') else str(user.role)
-            self.dashboard_view.update_user_info(user.username, role)
+            self.dashboard_view.update_user_info(user.username, user.role.value)  # role é UserRole (User.__post_init__)
         # Sempre atualiza as câmeras ao mostrar o dashboard
-        if hasattr(self.dashboard_view, 'update_cameras'):
-            cameras = self.controller.get_cameras()
-            self.dashboard_view.update_cameras(cameras)
+        self._refresh_dashboard_cameras()
+
+    def _refresh_dashboard_cameras(self):
+        """Repassa ao dashboard as câmeras habilitadas (listas paralelas montadas pelo controller)"""
+        self.dashboard_view.update_cameras(*self.controller.get_dashboard_cameras())
+
+    def _request_dashboard_refresh(self):
+        """Agenda um refresh do dashboard; eventos dentro da janela de debounce são agrupados."""
+        if self._dash_refresh_pending:
+            return
+        self._dash_refresh_pending = True
+        self.root.after(DASHBOARD_REFRESH_DEBOUNCE_MS, self._do_dashboard_refresh)
+
+    def _do_dashboard_refresh(self):
+        self._dash_refresh_pending = False
+        if self.current_view == self.dashboard_view:
+            self._refresh_dashboard_cameras()
 
     def show_settings(self):
         """Mostra tela de configurações"""
-        if hasattr(self.settings_view, 'load_settings_to_ui'):
-            self.settings_view.load_settings_to_ui()
-        self._switch_view(self.settings_view)
+        settings_view = self._get_settings_view()
+        if hasattr(settings_view, 'load_settings_to_ui'):
+            settings_view.load_settings_to_ui()
+        self._switch_view(settings_view)
 
     def show_camera_window(self, camera_id: int):
         """Mostra (ou traz para frente) a janela de uma câmera específica."""
-        # Verifica se a janela já existe e está visível
-        if camera_id in self.camera_windows:
-            try:
-                # Tenta trazer a janela existente para frente
-                window = self.camera_windows[camera_id]
-                window.state('normal')  # Garante que não está minimizada
-                window.lift()
-                window.focus_force()  # Tenta forçar o foco
-                print(f"[ScreenManager] Janela da Câmera {camera_id} trazida para frente.")
-                return
-            except (tkinter.TclError, AttributeError):
-                # A janela foi destruída inesperadamente. Remove a referência.
-                print(f"[ScreenManager] Removendo referência inválida da Câmera {camera_id}.")
-                del self.camera_windows[camera_id]
-
-        # Busca configuração da câmera no controller
-        cameras = self.controller.get_cameras()
-        camera_config_dict = next((c for c in cameras if c.get('id') == camera_id), None)
+        # Janela já aberta: traz para frente (janelas destruídas já saíram de camera_windows)
+        window = self.camera_windows.get(camera_id)
+        if window is not None:
+            window.state('normal')  # Garante que não está minimizada
+            window.lift()
+            window.focus_force()  # Tenta forçar o foco
+            _log.info(f"Janela da Câmera {camera_id} trazida para frente.")
+            return
+
+        # Busca configuração da câmera no índice (recarregado do controller se faltar)
+        camera_config_dict = self._camera_config(camera_id)
 
         if not camera_config_dict:
             if hasattr(self.dashboard_view, 'show_error'):
@@ -159,55 +257,124 @@ class ScreenManager:
                 self.dashboard_view.show_notification(f"Câmera {camera_id} está desabilitada.", "warning")
             return
 
+        camera_name = camera_config_dict.get('name', f'Câmera {camera_id}')
+        pooled = self._cam_pool.pop(camera_id, None)
+        if pooled is not None and self._is_alive(camera_id, pooled):
+            # Reabre a janela escondida no último fechamento (protocolo e callbacks continuam valendo)
+            pooled.reset_for(camera_name)
+            self.camera_windows[camera_id] = pooled
+            self._cam_caps[camera_id] = _CameraWindowCaps.of(pooled, self.dashboard_view)
+            _log.info(f"Janela da Câmera {camera_id} reaberta.")
+            return
+
         # Cria a nova janela da câmera
         try:
-            print(f"[ScreenManager] Criando nova janela para Câmera {camera_id}...")
+            _log.info(f"Criando nova janela para Câmera {camera_id}...")
             camera_window = CameraView(
                 master=self.root,  # Mestre é a janela principal
                 camera_id=camera_id,
-                camera_name=camera_config_dict.get('name', f'Câmera {camera_id}'),
+                camera_name=camera_name,
                 on_start_detection=self._handle_start_detection,
                 on_stop_detection=self._handle_stop_detection,
-                on_generate_report=self._handle_generate_report  # Manter por ora
+                on_generate_report=self._handle_generate_report,  # Manter por ora
+                on_close=self._on_camera_window_close
             )
             self.camera_windows[camera_id] = camera_window
+            self._cam_caps[camera_id] = _CameraWindowCaps.of(camera_window, self.dashboard_view)
+            self._alive[camera_id] = camera_window
+            camera_window.bind("<Destroy>", lambda e, cid=camera_id, w=camera_window:
+                               self._mark_destroyed(e, cid, w), add="+")
             # Configura o fechamento pelo 'X' da janela
             camera_window.protocol("WM_DELETE_WINDOW", lambda cid=camera_id: self._on_camera_window_close(cid))
-            print(f"[ScreenManager] Janela da Câmera {camera_id} criada.")
+            _log.info(f"Janela da Câmera {camera_id} criada.")
         except Exception as e:
             error_msg = f"Erro ao criar janela para Câmera {camera_id}: {e}"
-            print(f"[ScreenManager] {error_msg}")
+            _log.error(error_msg)
             show_error_dialog("Erro Crítico", error_msg)
 
+    def _caps_for(self, camera_id: int) -> _CameraWindowCaps:
+        """Destinos de erro/notificação da janela aberta da câmera, ou os padrões do dashboard."""
+        return self._cam_caps.get(camera_id, self._default_caps)
+
+    def _is_alive(self, camera_id: int, window: CameraView) -> bool:
+        """Se a janela ainda não foi destruída (flag em Python, sem consultar o Tcl)."""
+        return self._alive.get(camera_id) is window
+
+    def _mark_destroyed(self, event, camera_id: int, window: CameraView):
+        # <Destroy> da Toplevel também dispara para cada filho: só a própria janela conta
+        if event.widget is not window or self._alive.get(camera_id) is not window:
+            return
+        del self._alive[camera_id]
+        # Limpeza imediata (sem esperar a coleta da referência fraca)
+        if self.camera_windows.get(camera_id) is window:
+            del self.camera_windows[camera_id]
+            self._cam_caps.pop(camera_id, None)
+            with self._pending_lock:
+                self._pending_update.pop(camera_id, None)
+        if self._cam_pool.get(camera_id) is window:
+            del self._cam_pool[camera_id]
+
+    def _camera_config(self, camera_id: int) -> Optional[dict]:
+        """Dados da câmera pelo id; reconstrói o índice uma vez quando o id não está nele."""
+        camera = self._cam_by_id.get(camera_id)
+        if camera is None:
+            self._cam_by_id = {c['id']: c for c in self.controller.get_cameras() if 'id' in c}
+            camera = self._cam_by_id.get(camera_id)
+        return camera
+
     def _on_camera_window_close(self, camera_id: int):
-        """Callback chamado quando a janela da câmera é fechada (pelo 'X' ou pelo botão 'Fechar' que chama destroy)."""
-        print(f"[ScreenManager] Tentativa de fechar janela da Câmera {camera_id}.")
+        """
+        Callback chamado quando a janela da câmera é fechada (pelo 'X' ou pelo botão 'Fechar').
+        A janela é escondida e guardada em _cam_pool para ser reaberta sem recriar os widgets.
+        """
+        _log.info(f"Tentativa de fechar janela da Câmera {camera_id}.")
         window = self.camera_windows.get(camera_id)
 
         # A janela pode já ter sido destruída por outro callback (ex: _on_camera_removed)
         if window is None:
-            print(f"[ScreenManager] Janela da Câmera {camera_id} já não existe.")
+            _log.info(f"Janela da Câmera {camera_id} já não existe.")
             return
 
         # A lógica de verificação se a detecção está ativa está no método _on_closing_attempt da CameraView
         # Aqui, apenas procedemos com a parada (se necessário) e limpeza.
         try:
             # Garante que a detecção seja parada
-            print(f"[ScreenManager] Garantindo parada da detecção para Câmera {camera_id} antes de fechar.")
+            _log.info(f"Garantindo parada da detecção para Câmera {camera_id} antes de fechar.")
             self.controller.stop_camera_detection(camera_id)  # Chama o stop do controller
+        except Exception as e:
+            _log.error(f"Erro ao parar a detecção da Câmera {camera_id}: {e}")
+        self._release_camera_window(camera_id, window)
 
-            # Destruição da janela (pode já ter sido chamada pelo _on_closing_attempt)
-            if window.winfo_exists():
-                print(f"[ScreenManager] Destruindo widget da Câmera {camera_id}.")
-                window.destroy()
+    def _close_all_camera_windows(self):
+        """Fecha todas as janelas de câmera: uma parada em lote no controller e depois as janelas."""
+        windows = list(self.camera_windows.items())
+        if not windows:
+            return
+        try:
+            self.controller.stop_all_detections([camera_id for camera_id, _ in windows])
+        except Exception as e:
+            _log.error(f"Erro ao parar as detecções das janelas abertas: {e}")
+        for camera_id, window in windows:
+            self._release_camera_window(camera_id, window)
+        _log.info(f"{len(windows)} janela(s) de câmera fechada(s).")
 
+    def _release_camera_window(self, camera_id: int, window: CameraView):
+        """Esconde a janela (detecção já parada), guarda no pool e remove as referências."""
+        try:
+            if self._is_alive(camera_id, window):
+                window.hide()
+                self._cam_pool[camera_id] = window
+                if len(self._cam_pool) > CAMERA_WINDOW_POOL_MAX:
+                    _, oldest = self._cam_pool.popitem(last=False)
+                    oldest.destroy()
         except Exception as e:
-            print(f"[ScreenManager] Erro durante o fechamento da Câmera {camera_id}: {e}")
+            _log.error(f"Erro durante o fechamento da Câmera {camera_id}: {e}")
         finally:
-            # Remove a referência do dicionário, independentemente de erros
-            if camera_id in self.camera_windows:
-                del self.camera_windows[camera_id]
-                print(f"[ScreenManager] Referência da Câmera {camera_id} removida.")
+            # Remove as referências, independentemente de erros
+            self.camera_windows.pop(camera_id, None)
+            self._cam_caps.pop(camera_id, None)
+            with self._pending_lock:
+                self._pending_update.pop(camera_id, None)
 
     # --- Handlers de Eventos da UI ---
 
@@ -225,38 +392,37 @@ class ScreenManager:
         self.show_camera_window(camera_id)
 
     # --- MÉTODO ATUALIZADO ---
-    def _handle_start_detection(self, camera_id: int, cargo_type: CargoType):
-        """Chamado pela CameraView para iniciar a detecção."""
-        print(f"[ScreenManager] Recebida solicitação para iniciar Câmera {camera_id} com tipo {cargo_type.value}")
-        self.controller.start_camera_detection(camera_id, cargo_type)
+    def _handle_start_detection(self, camera_id: int, cargo_type: CargoType) -> bool:
+        """Chamado pela CameraView para iniciar a detecção. Retorna se o pedido foi aceito."""
+        _log.info(f"Recebida solicitação para iniciar Câmera {camera_id} com tipo {cargo_type.value}")
+        return self.controller.start_camera_detection(camera_id, cargo_type)
 
     # --- FIM ATUALIZAÇÃO ---
 
-    def _handle_stop_detection(self, camera_id: int):
-        """Chamado pela CameraView para parar a detecção."""
-        print(f"[ScreenManager] Recebida solicitação para parar Câmera {camera_id}")
-        self.controller.stop_camera_detection(camera_id)
+    def _handle_stop_detection(self, camera_id: int) -> bool:
+        """Chamado pela CameraView para parar a detecção. Retorna se a parada foi confirmada."""
+        _log.info(f"Recebida solicitação para parar Câmera {camera_id}")
+        return self.controller.stop_camera_detection(camera_id)
 
     def _handle_generate_report(self, camera_id: int):
         """Chamado pela CameraView (botão Relatório Manual)."""
         # TODO: Implementar lógica para buscar última sessão e gerar relatório
-        print(f"[ScreenManager] Solicitação de relatório manual para Câmera {camera_id} (não implementado).")
+        _log.info(f"Solicitação de relatório manual para Câmera {camera_id} (não implementado).")
         # self.controller.generate_report_for_last_session(camera_id) # Exemplo
-        if camera_id in self.camera_windows:
-            self.camera_windows[camera_id].show_notification("Geração manual ainda não implementada.", "info")
+        self._caps_for(camera_id).notify_sink("Geração manual ainda não implementada.", "info")
 
     # --- Callbacks do Controller ---
 
     def _on_login_success(self, user: User):
         """Callback de login bem-sucedido."""
-        print(f"[ScreenManager] Login bem-sucedido: {user.username}")
+        _log.info(f"Login bem-sucedido: {user.username}")
         self.show_dashboard()
         if hasattr(self.login_view, 'clear_fields'):
             self.login_view.clear_fields()
 
     def _on_login_failed(self, message: str):
         """Callback de login falhado."""
-        print(f"[ScreenManager] Login falhou: {message}")
+        _log.info(f"Login falhou: {message}")
         if hasattr(self.login_view, 'show_error'):
             self.login_view.show_error(message)
         else:
@@ -264,22 +430,23 @@ class ScreenManager:
 
     def _on_register_success(self, message: str):
         """Callback de registro bem-sucedido (admin criando)."""
-        print(f"[ScreenManager] Registro (admin) bem-sucedido: {message}")
-        if hasattr(self.register_view, 'show_notification'):
-            self.register_view.show_notification(message, "success")
-        if hasattr(self.register_view, 'clear_fields'):
-            self.register_view.clear_fields()
+        _log.info(f"Registro (admin) bem-sucedido: {message}")
+        # A tela de registro pode ainda não ter sido criada: hasattr(None, ...) é False
+        if hasattr(self._register_view, 'show_notification'):
+            self._register_view.show_notification(message, "success")
+        if hasattr(self._register_view, 'clear_fields'):
+            self._register_view.clear_fields()
         # Volta ao login após um tempo
         self.root.after(2000, self.show_login)
 
     # --- ADICIONADO: Callback para auto-registro ---
     def _on_self_register_success(self, message: str):
         """Callback de auto-registro bem-sucedido."""
-        print(f"[ScreenManager] Auto-registro bem-sucedido: {message}")
-        if hasattr(self.register_view, 'show_notification'):
-            self.register_view.show_notification(message, "success")
-        if hasattr(self.register_view, 'clear_fields'):
-            self.register_view.clear_fields()
+        _log.info(f"Auto-registro bem-sucedido: {message}")
+        if hasattr(self._register_view, 'show_notification'):
+            self._register_view.show_notification(message, "success")
+        if hasattr(self._register_view, 'clear_fields'):
+            self._register_view.clear_fields()
         # Volta ao login após um tempo
         self.root.after(2000, self.show_login)
 
@@ -287,33 +454,31 @@ class ScreenManager:
 
     def _on_register_failed(self, message: str):
         """Callback de registro falhado."""
-        print(f"[ScreenManager] Registro falhou: {message}")
-        if hasattr(self.register_view, 'show_error'):
-            self.register_view.show_error(message)
+        _log.info(f"Registro falhou: {message}")
+        if hasattr(self._register_view, 'show_error'):
+            self._register_view.show_error(message)
         else:
             show_error_dialog("Erro de Registro", message)
 
     def _on_logout_success(self):
         """Callback de logout bem-sucedido."""
-        print("[ScreenManager] Logout realizado. Fechando janelas de câmera...")
+        _log.info("Logout realizado. Fechando janelas de câmera...")
         # Fecha todas as janelas de câmera abertas
-        for camera_id in list(self.camera_windows.keys()):
-            self._on_camera_window_close(camera_id)  # Usa o método de fechamento
+        self._close_all_camera_windows()
         self.show_login()
 
     def _on_detection_starting(self, camera_id: int):
         """Callback opcional indicando que a detecção está iniciando (antes de conectar)."""
-        print(f"[ScreenManager] Detecção iniciando para Câmera {camera_id}.")
+        _log.info(f"Detecção iniciando para Câmera {camera_id}.")
         # Pode atualizar a UI da CameraView para "Conectando..."
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'update_detection_status'):
-            # Passa um estado intermediário ou apenas atualiza o texto
-            self.camera_windows[camera_id].status_label.configure(text="Status: Conectando...", text_color="orange")
+        if camera_id in self.camera_windows:
+            self.camera_windows[camera_id].show_connecting_status()
 
     def _on_detection_started(self, camera_id: int):
         """Callback de detecção realmente iniciada (após conexão)."""
-        print(f"[ScreenManager] Detecção iniciada para Câmera {camera_id}.")
+        _log.info(f"Detecção iniciada para Câmera {camera_id}.")
         # Atualiza UI da CameraView
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'update_detection_status'):
+        if camera_id in self.camera_windows:
             self.camera_windows[camera_id].update_detection_status(True)
         # Atualiza UI do Dashboard (card)
         if hasattr(self.dashboard_view, 'update_camera_status'):
@@ -321,9 +486,9 @@ class ScreenManager:
 
     def _on_detection_stopped(self, camera_id: int):
         """Callback de detecção parada."""
-        print(f"[ScreenManager] Detecção parada para Câmera {camera_id}.")
+        _log.info(f"Detecção parada para Câmera {camera_id}.")
         # Atualiza UI da CameraView
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'update_detection_status'):
+        if camera_id in self.camera_windows:
             self.camera_windows[camera_id].update_detection_status(False)
         # Atualiza UI do Dashboard (card)
         if hasattr(self.dashboard_view, 'update_camera_status'):
@@ -331,87 +496,106 @@ class ScreenManager:
 
     def _on_detection_failed(self, camera_id: int, message: str):
         """Callback de falha na detecção (durante a execução ou ao iniciar)."""
-        print(f"[ScreenManager] Falha na detecção da Câmera {camera_id}: {message}")
-        # Mostra erro no dashboard se possível
-        if hasattr(self.dashboard_view, 'show_error'):
-            self.dashboard_view.show_error(f"Câmera {camera_id}: {message}")
-        else:
-            show_error_dialog(f"Erro Câmera {camera_id}", message)  # Fallback
+        _log.warning(f"Falha na detecção da Câmera {camera_id}: {message}")
+        # Mostra erro no dashboard (a janela da câmera é fechada logo abaixo)
+        self._default_caps.error_sink(camera_id, message)
 
         # Fecha a janela da câmera associada, se existir
         if camera_id in self.camera_windows:
-            print(f"[ScreenManager] Fechando janela da Câmera {camera_id} devido à falha.")
+            _log.info(f"Fechando janela da Câmera {camera_id} devido à falha.")
             self._on_camera_window_close(camera_id)  # Usa o método de fechamento seguro
 
     def _on_detection_update(self, camera_id: int, count: int, frame: Optional[Any]):
-        """Callback com novo frame e contagem."""
-        # Atualiza UI da CameraView se ela existir
-        if camera_id in self.camera_windows:
-            window = self.camera_windows[camera_id]
-            if hasattr(window, 'update_count'):
-                window.update_count(count)
-            # Verifica se o frame não é None antes de tentar atualizar
-            if frame is not None and hasattr(window, 'update_video_frame'):
+        """
+        Callback com novo frame e contagem (thread da detecção). Só grava o último
+        valor no slot da câmera, sem chamar o Tcl: _drain_ui o aplica na thread do Tk,
+        e frames que chegam antes disso substituem os anteriores.
+        """
+        if camera_id not in self.camera_windows:
+            return
+        with self._pending_lock:
+            if frame is None:  # Atualização só de contagem não descarta um frame pendente
+                pending = self._pending_update.get(camera_id)
+                frame = pending[1] if pending is not None else None
+            self._pending_update[camera_id] = (count, frame)
+
+    def _apply_camera_updates(self):
+        """Na thread do Tk: aplica a última contagem/frame pendente de cada câmera."""
+        if not self._pending_update:
+            return
+        with self._pending_lock:
+            updates, self._pending_update = self._pending_update, {}
+        for camera_id, (count, frame) in updates.items():
+            window = self.camera_windows.get(camera_id)
+            if window is None:
+                continue
+            window.update_count(count)
+            if frame is not None:
                 window.update_video_frame(frame)
 
+    def _on_frame_wanted(self, camera_id: int) -> bool:
+        """Diz à detecção se a janela da câmera está pronta para outro frame."""
+        window = self.camera_windows.get(camera_id)
+        if window is None:
+            return False
+        pending = self._pending_update.get(camera_id)
+        return (pending is None or pending[1] is None) and window.wants_frame()
+
     def _on_count_reset(self, camera_id: int):
         """Callback quando a contagem é resetada no backend."""
-        print(f"[ScreenManager] Contagem resetada para Câmera {camera_id}.")
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'update_count'):
+        _log.info(f"Contagem resetada para Câmera {camera_id}.")
+        if camera_id in self.camera_windows:
             self.camera_windows[camera_id].update_count(0)
 
     def _on_report_generated(self, camera_id: int, filepath: str):
         """Callback de relatório gerado com sucesso."""
-        print(f"[ScreenManager] Relatório gerado para Câmera {camera_id}: {filepath}")
+        _log.info(f"Relatório gerado para Câmera {camera_id}: {filepath}")
         msg = f"Relatório salvo em:\n{filepath}"
         # Notifica na janela da câmera, se aberta, ou no dashboard
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'show_notification'):
-            self.camera_windows[camera_id].show_notification(msg, "success")
-        elif hasattr(self.dashboard_view, 'show_notification'):
-            self.dashboard_view.show_notification(msg, "success")
+        self._caps_for(camera_id).notify_sink(msg, "success")
 
     def _on_report_failed(self, camera_id: int, message: str):
         """Callback de falha na geração do relatório."""
-        print(f"[ScreenManager] Falha ao gerar relatório para Câmera {camera_id}: {message}")
+        _log.warning(f"Falha ao gerar relatório para Câmera {camera_id}: {message}")
         msg = f"Erro ao gerar relatório: {message}"
         # Mostra erro na janela da câmera, se aberta, ou no dashboard
-        if camera_id in self.camera_windows and hasattr(self.camera_windows[camera_id], 'show_error'):
-            self.camera_windows[camera_id].show_error(msg)  # Usa método da view se existir
-        elif hasattr(self.dashboard_view, 'show_error'):
-            self.dashboard_view.show_error(f"Câmera {camera_id}: {msg}")
-        else:
-            show_error_dialog(f"Erro Relatório Câmera {camera_id}", message)  # Fallback
+        self._caps_for(camera_id).error_sink(camera_id, msg)
 
     def _on_config_updated(self, camera_id: Optional[int] = None):
         """Callback quando a configuração (geral ou de câmera) é salva."""
-        print(
-            f"[ScreenManager] Configuração atualizada (Câmera: {camera_id if camera_id else 'Geral'}). Atualizando Dashboard.")
+        _log.info(
+            f"Configuração atualizada (Câmera: {camera_id if camera_id else 'Geral'}). Atualizando Dashboard.")
+        if camera_id is None:
+            self._cam_by_id.clear()
+        else:
+            self._cam_by_id.pop(camera_id, None)
         # Se o dashboard estiver visível, atualiza as câmeras
-        if self.current_view == self.dashboard_view and hasattr(self.dashboard_view, 'update_cameras'):
-            cameras = self.controller.get_cameras()
-            self.dashboard_view.update_cameras(cameras)
+        if self.current_view == self.dashboard_view:
+            self._request_dashboard_refresh()
 
     def _on_camera_added(self, camera_id: int):
         """Callback quando uma câmera é adicionada."""
-        print(f"[ScreenManager] Câmera {camera_id} adicionada. Atualizando Dashboard.")
-        if self.current_view == self.dashboard_view and hasattr(self.dashboard_view, 'update_cameras'):
-            cameras = self.controller.get_cameras()
-            self.dashboard_view.update_cameras(cameras)
+        _log.info(f"Câmera {camera_id} adicionada. Atualizando Dashboard.")
+        if self.current_view == self.dashboard_view:
+            self._request_dashboard_refresh()
 
     def _on_camera_removed(self, camera_id: int):
         """Callback quando uma câmera é removida."""
-        print(f"[ScreenManager] Câmera {camera_id} removida. Fechando janela e atualizando Dashboard.")
-        # Fecha a janela da câmera, se estiver aberta
+        _log.info(f"Câmera {camera_id} removida. Fechando janela e atualizando Dashboard.")
+        self._cam_by_id.pop(camera_id, None)
+        # Fecha a janela da câmera, se estiver aberta, e descarta a janela escondida
         if camera_id in self.camera_windows:
             self._on_camera_window_close(camera_id)  # Usa o método de fechamento
+        pooled = self._cam_pool.pop(camera_id, None)
+        if pooled is not None and self._is_alive(camera_id, pooled):
+            pooled.destroy()
         # Atualiza o dashboard
-        if self.current_view == self.dashboard_view and hasattr(self.dashboard_view, 'update_cameras'):
-            cameras = self.controller.get_cameras()
-            self.dashboard_view.update_cameras(cameras)
+        if self.current_view == self.dashboard_view:
+            self._request_dashboard_refresh()
 
     def _on_error(self, message: str):
         """Callback de erro genérico do AppController."""
-        print(f"[ScreenManager] Recebido erro do Controller: {message}")
+        _log.warning(f"Recebido erro do Controller: {message}")
         # Tenta mostrar na view atual, senão usa diálogo global
         if self.current_view and hasattr(self.current_view, 'show_error'):
             self.current_view.show_error(message)
@@ -420,10 +604,13 @@ class ScreenManager:
 
     def shutdown(self):
         """Encerra o gerenciador de telas e chama shutdown do controller."""
-        print("[ScreenManager] Iniciando processo de desligamento...")
+        _log.info("Iniciando processo de desligamento...")
         # Fecha todas as janelas de câmera de forma segura
-        for camera_id in list(self.camera_windows.keys()):
-            self._on_camera_window_close(camera_id)
+        self._close_all_camera_windows()
+        for camera_id, window in list(self._cam_pool.items()):  # O <Destroy> remove do pool
+            if self._is_alive(camera_id, window):
+                window.destroy()
+        self._cam_pool.clear()
         # Chama shutdown do controller (que deve parar as threads de detecção)
         self.controller.shutdown()
-        print("[ScreenManager] Desligamento concluído.")
\ No newline at end of file
+        _log.info("Desligamento concluído.")
\ No newline at end of file